@@ -8,19 +8,25 @@ Copyright (c) 2024 Harbor Contributors
 Licensed under the MIT License
 """
 
+import functools
+from types import MappingProxyType
+
+
 __version__ = "0.1.0-alpha.2"
 __description__ = "Automated Docker container updates for home labs and enterprises"
 __author__ = "Harbor Contributors"
 __license__ = "MIT"
 
-# Harbor feature information
-__features__ = {
-    "home_lab_optimized": True,
-    "zero_config": True,
-    "enterprise_ready": True,
-    "multi_architecture": True,
-    "privacy_first": True,
-}
+# Harbor feature information (read-only)
+__features__ = MappingProxyType(
+    {
+        "home_lab_optimized": True,
+        "zero_config": True,
+        "enterprise_ready": True,
+        "multi_architecture": True,
+        "privacy_first": True,
+    }
+)
 
 # Deployment profile information
 __profiles__ = ["homelab", "development", "staging", "production"]
@@ -78,8 +84,9 @@ def get_version() -> str:
     return __version__
 
 
-def get_app_info() -> dict:
-    """Get application information."""
+@functools.cache
+def _app_info() -> dict:
+    """Build the static application information once."""
     return {
         "name": "Harbor Container Updater",
         "version": __version__,
@@ -88,8 +95,20 @@ def get_app_info() -> dict:
         "description": __description__,
         "milestone": __milestone__,
         "status": __status__,
-        "features": __features__,
-        "profiles": __profiles__,
         "project_url": "https://github.com/DeusExTaco/harbor",
         "docs_url": "https://harbor-docs.dev",
     }
+
+
+def get_app_info() -> dict:
+    """
+    Get application information.
+
+    Returns a new JSON-serializable dict on every call, so callers may
+    modify it without affecting each other.
+    """
+    return {
+        **_app_info(),
+        "features": dict(__features__),
+        "profiles": list(__profiles__),
+    }
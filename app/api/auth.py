@@ -5,10 +5,20 @@ Harbor Authentication API Endpoints
 Handles login, logout, session management, and user operations.
 """
 
+import functools
 from datetime import UTC, datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
-from sqlalchemy import select
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, update
 
 from app.auth.api_keys import generate_api_key
 from app.auth.dependencies import (
@@ -16,6 +26,7 @@ from app.auth.dependencies import (
     CSRFToken,
     CurrentUser,
     DatabaseSession,
+    clear_default_user_cache,
     get_current_session,
 )
 from app.auth.manager import get_auth_manager
@@ -28,102 +39,190 @@ from app.auth.models import (
     LoginResponse,
     UserInfo,
 )
-from app.auth.password import hash_password, validate_password, verify_password
+from app.auth.password import (
+    dummy_password_hash,
+    hash_password_async,
+    needs_rehash,
+    validate_password,
+    verify_password_async,
+)
 from app.auth.sessions import SessionData
-from app.config import get_settings
+from app.auth.user_cache import get_user_cache, get_user_cached
+from app.config import get_settings, on_settings_reload
 from app.db.models.api_key import APIKey
 from app.db.models.user import User
-from app.utils.logging import get_logger
+from app.db.session import get_async_session
+from app.security.rate_limit import TokenBucketRateLimiter
+from app.utils.logging import Sanitized, get_logger
 
 
 logger = get_logger(__name__)
 
-router = APIRouter(prefix="/api/v1/auth", tags=["authentication"])
+# orjson ships with the prod extra; fall back to stdlib JSON without it
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse
 
+    DefaultResponse: type[JSONResponse] = ORJSONResponse
+except ImportError:
+    DefaultResponse = JSONResponse
 
-def sanitize_for_logging(value: str) -> str:
-    """
-    Sanitize user input for safe logging.
+router = APIRouter(
+    prefix="/api/v1/auth",
+    tags=["authentication"],
+    default_response_class=DefaultResponse,
+)
 
-    Removes newlines and carriage returns to prevent log injection attacks.
-    Limits length to prevent excessive log entries.
 
-    Args:
-        value: The string to sanitize
+@functools.cache
+def _cookie_params() -> tuple[int, str]:
+    """
+    Get session cookie parameters derived from settings.
+
+    The Set-Cookie header is pre-rendered as a template with the same
+    attribute layout Starlette's set_cookie produces, leaving only the
+    session ID and max age to fill in per request.
 
     Returns:
-        Sanitized string safe for logging
+        Tuple of (max_age_seconds, set_cookie_template)
     """
-    if not value:
-        return ""
+    security = get_settings().security
+    template = (
+        "harbor_session={session_id}; HttpOnly; Max-Age={max_age}; Path=/; SameSite=lax"
+    )
+    if security.require_https:
+        template += "; Secure"
+    return security.session_timeout_hours * 3600, template
 
-    # Remove newlines, carriage returns, and other control characters
-    sanitized = value.replace("\r", "").replace("\n", "").replace("\t", " ")
 
-    # Remove any other control characters
-    sanitized = "".join(char if ord(char) >= 32 else "" for char in sanitized)
+# Recompute cookie parameters only when the configuration changes
+on_settings_reload(_cookie_params.cache_clear)
 
-    # Limit length to prevent log flooding
-    max_length = 100
-    if len(sanitized) > max_length:
-        sanitized = sanitized[:max_length] + "..."
+# Failed logins per client IP: bursts of 10, then one attempt per minute
+_failed_login_limiter = TokenBucketRateLimiter(capacity=10, refill_rate=1 / 60)
 
-    return sanitized
+
+def _set_session_cookie(response: Response, session_id: str, max_age: int) -> None:
+    """
+    Append the session Set-Cookie header to a response.
+
+    Session IDs are URL-safe tokens, so no cookie quoting is needed.
+
+    Args:
+        response: Response to add the cookie to
+        session_id: Session ID cookie value
+        max_age: Cookie lifetime in seconds
+    """
+    _, template = _cookie_params()
+    header = template.format(session_id=session_id, max_age=max_age)
+    response.raw_headers.append((b"set-cookie", header.encode("latin-1")))
+
+
+async def _record_failed_login(user_id: int, failed_at: datetime) -> None:
+    """
+    Increment a user's failed login counter in its own session.
+
+    Runs as a background task after the failed-login response is sent.
+
+    Args:
+        user_id: ID of the user whose login failed
+        failed_at: Time of the failed attempt
+    """
+    try:
+        async with get_async_session() as session:
+            await session.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(
+                    failed_login_count=User.failed_login_count + 1,
+                    last_failed_login_at=failed_at,
+                )
+            )
+    except Exception as e:
+        logger.error(f"Failed to record failed login for user {user_id}: {e}")
 
 
 @router.post("/login", response_model=LoginResponse)
 async def login(
     request: Request,
-    response: Response,
     login_data: LoginRequest,
     db: DatabaseSession,
-) -> LoginResponse:
+    background_tasks: BackgroundTasks,
+) -> Response:
     """
     Authenticate user and create session.
 
     Creates a session-based authentication for web UI access.
     Sets an HTTP-only cookie with the session ID.
     """
-    # Find user
-    stmt = select(User).where(User.username == login_data.username)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    # Reserve a failure token before touching the database or spending CPU
+    # on password hashing, so concurrent attempts cannot all pass the check
+    # while earlier ones are still being verified. Refunded on success
+    client_ip = request.client.host if request.client else "unknown"
+    if not _failed_login_limiter.consume(client_ip):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts. Try again later.",
+            headers={"Retry-After": str(_failed_login_limiter.retry_after(client_ip))},
+        )
+
+    # Lock accounts with too many recent failures, whichever client made them
+    auth_manager = get_auth_manager()
+    if await auth_manager.is_account_locked(login_data.username):
+        logger.warning(
+            "Login attempt for locked account: %s",
+            Sanitized(login_data.username),
+        )
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Account temporarily locked due to too many failed attempts",
+        )
+
+    # Find user (served from the in-process cache when possible)
+    user = await get_user_cached(db, login_data.username)
 
     if not user:
-        # Sanitize username before logging to prevent log injection
-        safe_username = sanitize_for_logging(login_data.username)
-        logger.warning(f"Login attempt for non-existent user: {safe_username}")
+        # Verify against a dummy hash so unknown usernames take as long as
+        # known ones and cannot be enumerated by timing
+        await verify_password_async(login_data.password, dummy_password_hash())
+        await auth_manager.record_failed_attempt(login_data.username)
+        logger.warning(
+            "Login attempt for non-existent user: %s",
+            Sanitized(login_data.username),
+        )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password",
         )
 
+    # Verify password before checking account status so every known user
+    # pays the same hashing cost. Argon2 is CPU-bound; keep it off the loop
+    password_ok = await verify_password_async(login_data.password, user.password_hash)
+    if password_ok:
+        _failed_login_limiter.refund(client_ip)
+
     # Check if user is active
     if not user.is_active:
-        # Use the stored username from database (already validated)
-        safe_username = sanitize_for_logging(user.username)
-        logger.warning(f"Login attempt for inactive user: {safe_username}")
+        logger.warning("Login attempt for inactive user: %s", Sanitized(user.username))
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Account is disabled"
         )
 
-    # Verify password
-    if not verify_password(login_data.password, user.password_hash):
-        # Use the stored username from database (already validated)
-        safe_username = sanitize_for_logging(user.username)
-        logger.warning(f"Failed password for user: {safe_username}")
-        # Update failed login count
-        user.failed_login_count = (user.failed_login_count or 0) + 1
-        user.last_failed_login_at = datetime.now(UTC)
-        await db.commit()
-
-        raise HTTPException(
+    if not password_ok:
+        await auth_manager.record_failed_attempt(login_data.username)
+        logger.warning("Failed password for user: %s", Sanitized(user.username))
+        # Record the failure after the 401 is sent. Returned rather than
+        # raised, since background tasks only run for returned responses
+        background_tasks.add_task(_record_failed_login, user.id, datetime.now(UTC))
+        return DefaultResponse(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid username or password",
+            content={"detail": "Invalid username or password"},
+            background=background_tasks,
         )
 
+    await auth_manager.clear_failed_attempts(login_data.username)
+
     # Create session
-    auth_manager = get_auth_manager()
     session = auth_manager.session_manager.create_session(
         user_id=user.id,
         username=user.username,
@@ -134,32 +233,27 @@ async def login(
     )
 
     # Update user login info
-    user.last_login_at = datetime.now(UTC)
-    user.last_login_ip = request.client.host if request.client else None
-    user.login_count = (user.login_count or 0) + 1
-    user.failed_login_count = 0
+    login_values = {
+        "last_login_at": datetime.now(UTC),
+        "last_login_ip": request.client.host if request.client else None,
+        "login_count": User.login_count + 1,
+        "failed_login_count": 0,
+    }
+    # Upgrade hashes made with outdated Argon2 parameters while the
+    # plaintext password is at hand
+    if needs_rehash(user.password_hash):
+        login_values["password_hash"] = await hash_password_async(login_data.password)
+    await db.execute(update(User).where(User.id == user.id).values(**login_values))
     await db.commit()
-
-    # Set session cookie
-    settings = get_settings()
-    max_age = settings.security.session_timeout_hours * 3600
-    if login_data.remember_me:
-        max_age = max_age * 4  # Extend for remember me
-
-    response.set_cookie(
-        key="harbor_session",
-        value=session.session_id,
-        max_age=max_age,
-        httponly=True,
-        secure=settings.security.require_https,
-        samesite="lax",
-    )
+    if "password_hash" in login_values:
+        get_user_cache().invalidate(user_id=user.id)
 
     # Safe logging of successful login
-    safe_username = sanitize_for_logging(user.username)
-    logger.info(f"User {safe_username} logged in successfully")
+    logger.info("User %s logged in successfully", Sanitized(user.username))
 
-    return LoginResponse(
+    # The fields are already known to be valid, so skip model validation but
+    # still serialize through LoginResponse to keep the response format
+    body = LoginResponse.model_construct(
         success=True,
         message="Login successful",
         user={
@@ -172,6 +266,16 @@ async def login(
         csrf_token=session.csrf_token,
         expires_at=session.expires_at,
     )
+    response = DefaultResponse(content=body.model_dump(mode="json"))
+
+    # Set session cookie
+    max_age, _ = _cookie_params()
+    if login_data.remember_me:
+        max_age = max_age * 4  # Extend for remember me
+
+    _set_session_cookie(response, session.session_id, max_age)
+
+    return response
 
 
 @router.post("/logout")
@@ -225,7 +329,9 @@ async def change_password(
     Change current user's password.
     """
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.password_hash):
+    if not await verify_password_async(
+        password_data.current_password, current_user.password_hash
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Current password is incorrect",
@@ -240,7 +346,7 @@ async def change_password(
         )
 
     # Update password
-    current_user.password_hash = hash_password(password_data.new_password)
+    current_user.password_hash = await hash_password_async(password_data.new_password)
     current_user.password_changed_at = datetime.now(UTC)
 
     # Invalidate all sessions for security
@@ -248,10 +354,11 @@ async def change_password(
     auth_manager.logout_user(current_user.id)
 
     await db.commit()
+    get_user_cache().invalidate(current_user.id, current_user.username)
+    clear_default_user_cache()
 
     # Safe logging
-    safe_username = sanitize_for_logging(current_user.username)
-    logger.info(f"Password changed for user {safe_username}")
+    logger.info("Password changed for user %s", Sanitized(current_user.username))
 
     return {"message": "Password changed successfully. Please log in again."}
 
@@ -270,9 +377,7 @@ async def create_user(
     for future multi-user support (M8+).
     """
     # Check if user exists
-    stmt = select(User).where(User.username == user_data.username)
-    result = await db.execute(stmt)
-    if result.scalar_one_or_none():
+    if await get_user_cached(db, user_data.username):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Username already exists",
@@ -287,9 +392,10 @@ async def create_user(
         )
 
     # Create user
+    password_hash = await hash_password_async(user_data.password)
     new_user = User(
         username=user_data.username,
-        password_hash=hash_password(user_data.password),
+        password_hash=password_hash,
         email=user_data.email,
         display_name=user_data.display_name,
         is_admin=user_data.is_admin,
@@ -299,11 +405,14 @@ async def create_user(
     db.add(new_user)
     await db.commit()
     await db.refresh(new_user)
+    get_user_cache().invalidate(new_user.id, new_user.username)
 
     # Safe logging
-    safe_new_username = sanitize_for_logging(new_user.username)
-    safe_admin_username = sanitize_for_logging(admin_user.username)
-    logger.info(f"User {safe_new_username} created by {safe_admin_username}")
+    logger.info(
+        "User %s created by %s",
+        Sanitized(new_user.username),
+        Sanitized(admin_user.username),
+    )
 
     return UserInfo(
         id=new_user.id,
@@ -335,10 +444,11 @@ async def create_api_key(
     # Generate API key
     plain_key, hashed_key = generate_api_key()
 
-    # Calculate expiration
+    # Calculate expiration from the same timestamp as created_at
+    now = datetime.now(UTC)
     expires_at = None
     if key_data.expires_days:
-        expires_at = datetime.now(UTC) + timedelta(days=key_data.expires_days)
+        expires_at = now + timedelta(days=key_data.expires_days)
 
     # Create API key record
     api_key = APIKey(
@@ -347,7 +457,7 @@ async def create_api_key(
         key_hash=hashed_key,
         created_by_user_id=current_user.id,
         expires_at=expires_at,
-        created_at=datetime.now(UTC),
+        created_at=now,
     )
 
     # Set scopes using the property setter (handles JSON serialization)
@@ -358,9 +468,11 @@ async def create_api_key(
     await db.refresh(api_key)
 
     # Safe logging
-    safe_key_name = sanitize_for_logging(api_key.name)
-    safe_username = sanitize_for_logging(current_user.username)
-    logger.info(f"API key '{safe_key_name}' created by user {safe_username}")
+    logger.info(
+        "API key '%s' created by user %s",
+        Sanitized(api_key.name),
+        Sanitized(current_user.username),
+    )
 
     return APIKeyResponse(
         api_key=plain_key,
@@ -381,25 +493,34 @@ async def list_api_keys(
 
     Note: Never returns actual keys, only metadata.
     """
-    stmt = select(APIKey).where(
+    # Select only the listed columns to skip ORM instance construction
+    stmt = select(
+        APIKey.id,
+        APIKey.name,
+        APIKey.description,
+        APIKey.created_at,
+        APIKey.expires_at,
+        APIKey.last_used_at,
+        APIKey.usage_count,
+        APIKey._scopes.label("scopes"),
+    ).where(
         APIKey.created_by_user_id == current_user.id,
-        APIKey.is_active == True,
+        APIKey.is_active.is_(True),
     )
     result = await db.execute(stmt)
-    keys = result.scalars().all()
 
     return [
         {
-            "id": key.id,
-            "name": key.name,
-            "description": key.description,
-            "created_at": key.created_at,
-            "expires_at": key.expires_at,
-            "last_used_at": key.last_used_at,
-            "usage_count": key.usage_count or 0,
-            "scopes": key.scopes,  # Uses the property to get list
+            "id": row.id,
+            "name": row.name,
+            "description": row.description,
+            "created_at": row.created_at,
+            "expires_at": row.expires_at,
+            "last_used_at": row.last_used_at,
+            "usage_count": row.usage_count or 0,
+            "scopes": APIKey.parse_scopes(row.scopes),
         }
-        for key in keys
+        for row in result.all()
     ]
 
 
@@ -432,11 +553,14 @@ async def revoke_api_key(
     # Revoke key using the model's method
     api_key.revoke()
     await db.commit()
+    get_auth_manager().invalidate_api_key(api_key.key_hash)
 
     # Safe logging
-    safe_key_name = sanitize_for_logging(api_key.name)
-    safe_username = sanitize_for_logging(current_user.username)
-    logger.info(f"API key '{safe_key_name}' revoked by user {safe_username}")
+    logger.info(
+        "API key '%s' revoked by user %s",
+        Sanitized(api_key.name),
+        Sanitized(current_user.username),
+    )
 
     return {"message": "API key revoked successfully"}
 
@@ -465,15 +589,8 @@ async def refresh_session(
         )
 
     # Update cookie expiration
-    settings = get_settings()
-    response.set_cookie(
-        key="harbor_session",
-        value=refreshed_session.session_id,
-        max_age=settings.security.session_timeout_hours * 3600,
-        httponly=True,
-        secure=settings.security.require_https,
-        samesite="lax",
-    )
+    max_age, _ = _cookie_params()
+    _set_session_cookie(response, refreshed_session.session_id, max_age)
 
     logger.info(f"Session refreshed for user (session: {session.session_id[:8]}...)")
 
@@ -6,23 +6,62 @@ Provides secure authentication and authorization for Harbor.
 Implements M0 milestone authentication requirements.
 """
 
-from app.auth.api_keys import generate_api_key, hash_api_key, validate_api_key
-from app.auth.csrf import get_csrf_protection
-from app.auth.dependencies import (
-    AdminUser,
-    CurrentUser,
-    get_admin_user,
-    get_current_active_user,
-    get_current_user,
-)
-from app.auth.manager import AuthenticationManager, get_auth_manager
-from app.auth.password import (
-    generate_password,
-    hash_password,
-    validate_password,
-    verify_password,
-)
-from app.auth.sessions import SessionData, SessionManager, get_session_manager
+import importlib
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from app.auth.api_keys import generate_api_key, hash_api_key, validate_api_key
+    from app.auth.csrf import get_csrf_protection
+    from app.auth.dependencies import (
+        AdminUser,
+        CurrentUser,
+        get_admin_user,
+        get_current_active_user,
+        get_current_user,
+    )
+    from app.auth.manager import AuthenticationManager, get_auth_manager
+    from app.auth.password import (
+        generate_password,
+        hash_password,
+        validate_password,
+        verify_password,
+    )
+    from app.auth.sessions import SessionData, SessionManager, get_session_manager
+
+
+# Public name -> defining submodule, imported on first attribute access
+_LAZY_IMPORTS = {
+    "generate_api_key": "app.auth.api_keys",
+    "hash_api_key": "app.auth.api_keys",
+    "validate_api_key": "app.auth.api_keys",
+    "get_csrf_protection": "app.auth.csrf",
+    "AdminUser": "app.auth.dependencies",
+    "CurrentUser": "app.auth.dependencies",
+    "get_admin_user": "app.auth.dependencies",
+    "get_current_active_user": "app.auth.dependencies",
+    "get_current_user": "app.auth.dependencies",
+    "AuthenticationManager": "app.auth.manager",
+    "get_auth_manager": "app.auth.manager",
+    "generate_password": "app.auth.password",
+    "hash_password": "app.auth.password",
+    "validate_password": "app.auth.password",
+    "verify_password": "app.auth.password",
+    "SessionData": "app.auth.sessions",
+    "SessionManager": "app.auth.sessions",
+    "get_session_manager": "app.auth.sessions",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import public auth symbols lazily so `import app.auth` stays cheap."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
 
 
 __all__ = [
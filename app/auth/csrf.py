@@ -5,13 +5,22 @@ Harbor CSRF Protection
 Cross-Site Request Forgery protection for web UI.
 """
 
-import secrets
+import base64
+import hmac
+import os
 
 from app.utils.logging import get_logger
 
 
 logger = get_logger(__name__)
 
+# Bound once: equivalent to secrets.token_urlsafe without its call chain
+_urandom = os.urandom
+_b64encode = base64.urlsafe_b64encode
+
+# 128 bits of entropy; encodes to a 22-character URL-safe token
+CSRF_TOKEN_BYTES = 16
+
 
 class CSRFProtection:
     """
@@ -20,7 +29,7 @@ class CSRFProtection:
 
     def __init__(self):
         """Initialize CSRF protection."""
-        self.token_length = 32
+        self.token_length = CSRF_TOKEN_BYTES
 
     def generate_token(self) -> str:
         """
@@ -29,7 +38,7 @@ class CSRFProtection:
         Returns:
             Secure random CSRF token
         """
-        token = secrets.token_urlsafe(self.token_length)
+        token = _b64encode(_urandom(self.token_length)).rstrip(b"=").decode("ascii")
         logger.debug("CSRF token generated")
         return token
 
@@ -44,11 +53,13 @@ class CSRFProtection:
         Returns:
             True if tokens match
         """
-        if not token or not expected:
+        # Generated tokens are ASCII, and compare_digest raises on non-ASCII
+        # str; isascii() is a flag check, so no bytes copies are needed
+        if not token or not expected or not token.isascii():
             return False
 
         # Use constant-time comparison to prevent timing attacks
-        return secrets.compare_digest(token, expected)
+        return hmac.compare_digest(token, expected)
 
     def generate_form_token(self, session_token: str) -> str:
         """
@@ -5,13 +5,19 @@ Harbor Authentication Dependencies
 FastAPI dependency injection for authentication and authorization.
 """
 
+import time
 from typing import Annotated
 
 from fastapi import Depends, Header, HTTPException, Request, status
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.manager import get_auth_manager
+from app.auth.middleware import (
+    API_KEY_STATE_KEY,
+    SESSION_STATE_KEY,
+    extract_auth_headers,
+    extract_session_cookie,
+)
 from app.auth.sessions import SessionData
 from app.config import get_settings
 from app.db.models.user import User
@@ -21,26 +27,73 @@ from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
-# Security schemes
-bearer_scheme = HTTPBearer(auto_error=False)
+# Methods that don't change state and so skip CSRF validation
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+# Default admin user used when authentication is not required. Only its
+# primary key is cached as (cached_at, user_id), with None recording that the
+# user does not exist so such setups skip the lookup entirely. The user itself
+# is always loaded through the request's session, so it is never stale.
+DEFAULT_USER_ID = 1
+DEFAULT_USER_CACHE_TTL = 5.0
+_default_user_id: tuple[float, int | None] | None = None
+
+
+def clear_default_user_cache() -> None:
+    """Drop the cached default user id (call after modifying that user)."""
+    global _default_user_id
+    _default_user_id = None
+
+
+async def _get_default_user(db: AsyncSession) -> User | None:
+    """
+    Get the default admin user for unauthenticated homelab/dev requests.
+
+    The user is loaded with db.get(), which returns it from the session's
+    identity map when this request has already loaded it.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Default user, or None if it does not exist
+    """
+    global _default_user_id
+
+    now = time.monotonic()
+    cached = _default_user_id
+    if cached is not None and now - cached[0] < DEFAULT_USER_CACHE_TTL:
+        if cached[1] is None:
+            return None
+        return await db.get(User, cached[1])
+
+    user = await db.get(User, DEFAULT_USER_ID)
+    _default_user_id = (now, user.id if user is not None else None)
+    return user
 
 
 async def get_current_session(
     request: Request,
-    db: AsyncSession = Depends(get_db),
 ) -> SessionData | None:
     """
     Get current session from cookie.
 
+    Uses the session already resolved by AuthSessionMiddleware when it is
+    installed, and validates the cookie directly otherwise.
+
     Args:
         request: FastAPI request
-        db: Database session
 
     Returns:
         Session data if valid
     """
-    # Get session ID from cookie
-    session_id = request.cookies.get("harbor_session")
+    state = request.scope.get("state")
+    if state is not None and SESSION_STATE_KEY in state:
+        return state[SESSION_STATE_KEY]
+
+    # Get session ID from the Cookie header
+    session_id = extract_session_cookie(request.headers.get("cookie", ""))
 
     if not session_id:
         return None
@@ -52,10 +105,30 @@ async def get_current_session(
     return session
 
 
+def _get_request_api_key(request: Request) -> str | None:
+    """
+    Get the API key presented with a request.
+
+    Uses the key already extracted by AuthSessionMiddleware when it is
+    installed, and walks the raw headers otherwise.
+
+    Args:
+        request: FastAPI request
+
+    Returns:
+        API key from the X-API-Key header or Bearer token, if any
+    """
+    state = request.scope.get("state")
+    if state is not None and API_KEY_STATE_KEY in state:
+        return state[API_KEY_STATE_KEY]
+
+    _, api_key = extract_auth_headers(request.scope["headers"])
+    return api_key
+
+
 async def get_current_user(
+    request: Request,
     session: SessionData | None = Depends(get_current_session),
-    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
-    x_api_key: str | None = Header(None, alias="X-API-Key"),
     db: AsyncSession = Depends(get_db),
 ) -> User:
     """
@@ -64,9 +137,8 @@ async def get_current_user(
     Supports both session-based and API key authentication.
 
     Args:
+        request: FastAPI request
         session: Session from cookie
-        credentials: Bearer token credentials
-        x_api_key: API key from header
         db: Database session
 
     Returns:
@@ -85,15 +157,8 @@ async def get_current_user(
         if user and user.is_active:
             return user
 
-    # Check API key authentication
-    api_key = None
-
-    # Try X-API-Key header first
-    if x_api_key:
-        api_key = x_api_key
-    # Then try Bearer token
-    elif credentials and credentials.scheme == "Bearer":
-        api_key = credentials.credentials
+    # Check API key authentication (X-API-Key header, then Bearer token)
+    api_key = _get_request_api_key(request)
 
     if api_key:
         # Get client IP for logging
@@ -119,7 +184,7 @@ async def get_current_user(
         "development",
     ]:
         # Get or create default admin user
-        admin_user = await db.get(User, 1)
+        admin_user = await _get_default_user(db)
         if admin_user:
             return admin_user
 
@@ -196,7 +261,7 @@ async def validate_csrf_token(
         HTTPException: If CSRF validation fails
     """
     # Skip CSRF for GET, HEAD, OPTIONS
-    if request.method in ["GET", "HEAD", "OPTIONS"]:
+    if request.method in _SAFE_METHODS:
         return True
 
     # Skip if no session (API key auth)
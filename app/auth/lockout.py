@@ -0,0 +1,191 @@
+# app/auth/lockout.py
+"""
+Harbor Failed Login Tracking
+
+Stores recent failed login attempts per username for account lockout.
+The in-process store suits a single worker; the Redis store shares the
+counters between workers so lockout holds when the app is scaled out,
+degrading to per-process tracking while Redis is unreachable.
+"""
+
+import time
+from collections import deque
+from datetime import timedelta
+from typing import Any, Protocol
+
+from app.config import AuthStateBackend, HarborSettings
+from app.utils.cache import TTLCache
+from app.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class FailedAttemptsStore(Protocol):
+    """Storage for failed login attempts within the lockout window."""
+
+    async def increment(self, username: str) -> int:
+        """Record a failed attempt and return the recent attempt count."""
+        ...
+
+    async def count(self, username: str) -> int:
+        """Get the number of failed attempts within the lockout window."""
+        ...
+
+    async def reset(self, username: str) -> None:
+        """Forget all failed attempts for a username."""
+        ...
+
+
+class InMemoryFailedAttemptsStore:
+    """
+    Per-process failed attempt store with an exact sliding window.
+
+    Keeps the latest max_attempts timestamps per username in a bounded
+    TTL cache. Entries expire one window after a user's latest attempt,
+    so attacks spraying many usernames cannot grow it without limit.
+    Timestamps are monotonic-clock floats: they are only compared against
+    a cutoff, and floats are smaller and cheaper than aware datetimes.
+    """
+
+    def __init__(
+        self, max_attempts: int, window: timedelta, maxsize: int = 100_000
+    ) -> None:
+        """Initialize in-memory store."""
+        self.max_attempts = max_attempts
+        self.window = window
+        self._window_seconds = window.total_seconds()
+        self._attempts: TTLCache[str, deque[float]] = TTLCache(
+            maxsize=maxsize, ttl=self._window_seconds
+        )
+
+    def _prune(self, attempts: deque[float], now: float) -> None:
+        """Drop attempts older than the window (oldest first)."""
+        cutoff_time = now - self._window_seconds
+        while attempts and attempts[0] <= cutoff_time:
+            attempts.popleft()
+
+    async def increment(self, username: str) -> int:
+        """Record a failed attempt and return the recent attempt count."""
+        now = time.monotonic()
+        attempts = self._attempts.get(username)
+        if attempts is None:
+            attempts = deque(maxlen=self.max_attempts)
+
+        attempts.append(now)
+        # (Re)store to restart the entry's TTL from this latest attempt
+        self._attempts.set(username, attempts)
+        self._prune(attempts, now)
+        return len(attempts)
+
+    async def count(self, username: str) -> int:
+        """Get the number of failed attempts within the lockout window."""
+        attempts = self._attempts.get(username)
+        if attempts is None:
+            return 0
+        self._prune(attempts, time.monotonic())
+        return len(attempts)
+
+    async def reset(self, username: str) -> None:
+        """Forget all failed attempts for a username."""
+        self._attempts.pop(username)
+
+
+class RedisFailedAttemptsStore:
+    """
+    Failed attempt store shared between workers through Redis.
+
+    Uses an atomic INCR per username whose expiry is pushed back one
+    window on every failed attempt, so the count resets once a full
+    window passes without failures.
+
+    Redis errors never fail a login: each operation falls back to an
+    in-process store, so lockout keeps working per worker until Redis
+    is reachable again.
+    """
+
+    KEY_PREFIX = "harbor:failed_logins:"
+
+    def __init__(
+        self, client: Any, window: timedelta, fallback: FailedAttemptsStore
+    ) -> None:
+        """
+        Initialize Redis store.
+
+        Args:
+            client: redis.asyncio client
+            window: Lockout window
+            fallback: Store used while Redis is unavailable
+        """
+        self.client = client
+        self.window_seconds = int(window.total_seconds())
+        self.fallback = fallback
+
+    async def increment(self, username: str) -> int:
+        """Record a failed attempt and return the recent attempt count."""
+        key = self.KEY_PREFIX + username
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.incr(key)
+                pipe.expire(key, self.window_seconds)
+                count, _ = await pipe.execute()
+            return int(count)
+        except Exception as e:
+            logger.warning(f"Redis unavailable for failed login tracking: {e}")
+            return await self.fallback.increment(username)
+
+    async def count(self, username: str) -> int:
+        """Get the number of failed attempts within the lockout window."""
+        try:
+            value = await self.client.get(self.KEY_PREFIX + username)
+        except Exception as e:
+            logger.warning(f"Redis unavailable for failed login tracking: {e}")
+            return await self.fallback.count(username)
+        return int(value) if value is not None else 0
+
+    async def reset(self, username: str) -> None:
+        """Forget all failed attempts for a username."""
+        # Attempts may have been recorded locally during an outage
+        await self.fallback.reset(username)
+        try:
+            await self.client.delete(self.KEY_PREFIX + username)
+        except Exception as e:
+            logger.warning(f"Redis unavailable for failed login tracking: {e}")
+
+
+def create_failed_attempts_store(
+    settings: HarborSettings, max_attempts: int, window: timedelta
+) -> FailedAttemptsStore:
+    """
+    Create the failed attempt store selected by the security settings.
+
+    Falls back to the in-memory store if Redis is selected but the redis
+    package (production extra) is not installed, and uses one as the
+    Redis store's fallback while the server is unreachable.
+
+    Args:
+        settings: Application settings
+        max_attempts: Failed attempts that trigger a lockout
+        window: Lockout window
+
+    Returns:
+        Failed attempt store
+    """
+    memory_store = InMemoryFailedAttemptsStore(max_attempts, window)
+
+    if settings.security.auth_state_backend == AuthStateBackend.REDIS:
+        try:
+            import redis.asyncio as redis_asyncio
+
+            return RedisFailedAttemptsStore(
+                redis_asyncio.from_url(settings.security.redis_url),
+                window,
+                fallback=memory_store,
+            )
+        except ImportError:
+            logger.warning(
+                "Redis auth state backend selected but redis is not installed; "
+                "failed login tracking will be per-process"
+            )
+
+    return memory_store
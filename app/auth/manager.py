@@ -5,75 +5,88 @@ Harbor Authentication Manager
 Central authentication management for users and API keys.
 """
 
+import hmac
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, lambda_stmt, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.api_keys import get_api_key_manager
+from app.auth.api_keys import APIKeyManager, get_api_key_manager
 from app.auth.csrf import get_csrf_protection
-from app.auth.password import verify_password
+from app.auth.lockout import create_failed_attempts_store
+from app.auth.password import (
+    dummy_password_hash,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+)
 from app.auth.sessions import SessionData, get_session_manager
+from app.auth.usage import get_usage_tracker
+from app.auth.user_cache import get_user_cache
 from app.config import get_settings
 from app.db.models.api_key import APIKey
 from app.db.models.user import User
-from app.utils.logging import get_logger
+from app.utils.cache import TTLCache
+from app.utils.logging import Sanitized, get_logger
 
 
 logger = get_logger(__name__)
 
-
-def sanitize_for_logging(value: str) -> str:
+# Authentication lookups, built once; execution reuses the cached compiled SQL
+# without rebuilding the statement or its cache key per call
+_USER_BY_USERNAME = lambda_stmt(
+    lambda: select(User).where(User.username == bindparam("username"))
+)
+_ACTIVE_API_KEY_BY_HASH = lambda_stmt(
+    lambda: select(APIKey, User)
+    .outerjoin(User, APIKey.created_by_user_id == User.id)
+    .where(
+        APIKey.key_hash == bindparam("key_hash"),
+        APIKey.is_active == True,
+    )
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CachedAPIKey:
     """
-    Sanitize user input for safe logging.
-
-    Removes newlines and carriage returns to prevent log injection attacks.
-    Limits length to prevent excessive log entries.
-
-    Args:
-        value: The string to sanitize
+    Immutable snapshot of the API key fields needed for authentication.
 
-    Returns:
-        Sanitized string safe for logging
+    Revocation is the only change that invalidates a snapshot; the owning
+    user is always loaded fresh, so deactivating a user takes effect at once.
+    Invalidation is per process: a key revoked through another worker stays
+    usable here until its entry expires (the cache TTL, 30 seconds).
     """
-    if not value:
-        return ""
-
-    # Remove newlines, carriage returns, and other control characters
-    sanitized = value.replace("\r", "").replace("\n", "").replace("\t", " ")
-
-    # Remove any other control characters
-    sanitized = "".join(char if ord(char) >= 32 else "" for char in sanitized)
-
-    # Limit length to prevent log flooding
-    max_length = 100
-    if len(sanitized) > max_length:
-        sanitized = sanitized[:max_length] + "..."
 
-    return sanitized
+    id: int
+    name: str
+    user_id: int
+    expires_at: datetime | None
+
+    @classmethod
+    def from_api_key(cls, api_key: APIKey) -> "CachedAPIKey":
+        """Create a snapshot from an API key row."""
+        return cls(
+            id=api_key.id,
+            name=api_key.name,
+            user_id=api_key.created_by_user_id,
+            expires_at=api_key.expires_at,
+        )
 
 
+@dataclass(frozen=True, slots=True)
 class AuthenticationResult:
     """Container for authentication result."""
 
-    def __init__(
-        self,
-        success: bool,
-        user: User | None = None,
-        session: SessionData | None = None,
-        api_key: APIKey | None = None,
-        error_message: str | None = None,
-        requires_mfa: bool = False,
-        account_locked: bool = False,
-    ):
-        """Initialize authentication result."""
-        self.success = success
-        self.user = user
-        self.session = session
-        self.api_key = api_key
-        self.error_message = error_message
-        self.requires_mfa = requires_mfa
-        self.account_locked = account_locked
+    success: bool
+    user: User | None = None
+    session: SessionData | None = None
+    # Only set when the key record was loaded; None on API key cache hits
+    api_key: APIKey | None = None
+    error_message: str | None = None
+    requires_mfa: bool = False
+    account_locked: bool = False
 
 
 class AuthenticationManager:
@@ -87,15 +100,26 @@ class AuthenticationManager:
         """Initialize authentication manager."""
         self.settings = get_settings()
         self.session_manager = get_session_manager()
-        self.api_key_manager = get_api_key_manager()
         self.csrf_protection = get_csrf_protection()
 
         # Account lockout configuration
         self.max_login_attempts = 5
         self.lockout_duration_minutes = 30
+        self._lockout_delta = timedelta(minutes=self.lockout_duration_minutes)
+
+        # Track failed login attempts (in-process, or Redis when configured
+        # so lockout holds across workers)
+        self._failed_attempts = create_failed_attempts_store(
+            self.settings, self.max_login_attempts, self._lockout_delta
+        )
+
+        # Verified API keys by key hash, so repeat requests skip the lookup
+        self._api_key_cache: TTLCache[str, CachedAPIKey] = TTLCache(4096, 30)
 
-        # Track failed login attempts (in-memory for now)
-        self._failed_attempts: dict[str, list[datetime]] = {}
+    @property
+    def api_key_manager(self) -> APIKeyManager:
+        """API key manager, looked up per use so settings reloads apply."""
+        return get_api_key_manager()
 
     async def authenticate_user(
         self,
@@ -120,10 +144,11 @@ class AuthenticationManager:
         Returns:
             Authentication result
         """
+        now = datetime.now(UTC)
+
         # Check account lockout
-        if self._is_account_locked(username):
-            safe_username = sanitize_for_logging(username)
-            logger.warning(f"Login attempt for locked account: {safe_username}")
+        if await self.is_account_locked(username):
+            logger.warning("Login attempt for locked account: %s", Sanitized(username))
             return AuthenticationResult(
                 success=False,
                 error_message="Account temporarily locked due to too many failed attempts",
@@ -131,14 +156,17 @@ class AuthenticationManager:
             )
 
         # Find user
-        stmt = select(User).where(User.username == username)
-        result = await db.execute(stmt)
+        result = await db.execute(_USER_BY_USERNAME, {"username": username})
         user = result.scalar_one_or_none()
 
         if not user:
-            self._record_failed_attempt(username)
-            safe_username = sanitize_for_logging(username)
-            logger.warning(f"Login attempt for non-existent user: {safe_username}")
+            # Verify against a dummy hash so unknown usernames take as long as
+            # known ones and cannot be enumerated by timing
+            await verify_password_async(password, dummy_password_hash())
+            await self.record_failed_attempt(username)
+            logger.warning(
+                "Login attempt for non-existent user: %s", Sanitized(username)
+            )
             return AuthenticationResult(
                 success=False,
                 error_message="Invalid username or password",
@@ -146,22 +174,28 @@ class AuthenticationManager:
 
         # Check if user is active
         if not user.is_active:
-            safe_username = sanitize_for_logging(username)
-            logger.warning(f"Login attempt for inactive user: {safe_username}")
+            await verify_password_async(password, dummy_password_hash())
+            logger.warning("Login attempt for inactive user: %s", Sanitized(username))
             return AuthenticationResult(
                 success=False,
                 error_message="Account is disabled",
             )
 
         # Verify password
-        if not verify_password(password, user.password_hash):
-            self._record_failed_attempt(username)
-            safe_username = sanitize_for_logging(username)
-            logger.warning(f"Failed login attempt for user: {safe_username}")
-
-            # Update failed login count in database
-            user.failed_login_count = (user.failed_login_count or 0) + 1
-            user.last_failed_login_at = datetime.now(UTC)
+        # Argon2 is CPU-bound; run it off the event loop
+        if not await verify_password_async(password, user.password_hash):
+            await self.record_failed_attempt(username)
+            logger.warning("Failed login attempt for user: %s", Sanitized(username))
+
+            # Update failed login count in database (atomic SQL increment)
+            await db.execute(
+                update(User)
+                .where(User.id == user.id)
+                .values(
+                    failed_login_count=User.failed_login_count + 1,
+                    last_failed_login_at=now,
+                )
+            )
             await db.commit()
 
             return AuthenticationResult(
@@ -170,12 +204,11 @@ class AuthenticationManager:
             )
 
         # Clear failed attempts on successful login
-        self._clear_failed_attempts(username)
+        await self.clear_failed_attempts(username)
 
         # Check if MFA is enabled (future feature)
         if user.mfa_enabled:
-            safe_username = sanitize_for_logging(username)
-            logger.info(f"MFA required for user: {safe_username}")
+            logger.info("MFA required for user: %s", Sanitized(username))
             # TODO: Implement MFA in M7+
             # For now, MFA is behind a feature flag and not implemented
 
@@ -189,15 +222,23 @@ class AuthenticationManager:
             remember_me=remember_me,
         )
 
-        # Update user login info
-        user.last_login_at = datetime.now(UTC)
-        user.last_login_ip = ip_address
-        user.login_count = (user.login_count or 0) + 1
-        user.failed_login_count = 0  # Reset failed count
+        # Update user login info in a single UPDATE (atomic SQL increment)
+        login_values = {
+            "last_login_at": now,
+            "last_login_ip": ip_address,
+            "login_count": User.login_count + 1,
+            "failed_login_count": 0,  # Reset failed count
+        }
+        # Upgrade hashes made with outdated Argon2 parameters while the
+        # plaintext password is at hand
+        if needs_rehash(user.password_hash):
+            login_values["password_hash"] = await hash_password_async(password)
+        await db.execute(update(User).where(User.id == user.id).values(**login_values))
         await db.commit()
+        if "password_hash" in login_values:
+            get_user_cache().invalidate(user_id=user.id)
 
-        safe_username = sanitize_for_logging(username)
-        logger.info(f"User {safe_username} logged in successfully")
+        logger.info("User %s logged in successfully", Sanitized(username))
 
         return AuthenticationResult(
             success=True,
@@ -214,6 +255,9 @@ class AuthenticationManager:
         """
         Authenticate with API key.
 
+        Verified keys are cached briefly by hash; on a cache hit the key
+        record is not loaded and the result's api_key is None.
+
         Args:
             db: Database session
             api_key: API key to authenticate
@@ -222,62 +266,79 @@ class AuthenticationManager:
         Returns:
             Authentication result
         """
-        # Validate API key format
-        if not self.api_key_manager.validate_api_key_format(api_key):
+        # Validate API key format and hash it for lookup
+        key_hash = self.api_key_manager.extract_key_hash(api_key)
+        if key_hash is None:
             logger.warning("Invalid API key format")
             return AuthenticationResult(
                 success=False,
                 error_message="Invalid API key",
             )
 
-        # Hash the API key for lookup
-        key_hash = self.api_key_manager.hash_api_key(api_key)
-
-        # Find API key in database
-        stmt = select(APIKey).where(
-            APIKey.key_hash == key_hash,
-            APIKey.is_active == True,
-        )
-        result = await db.execute(stmt)
-        api_key_record = result.scalar_one_or_none()
-
-        if not api_key_record:
-            logger.warning(f"API key authentication failed from {ip_address}")
-            return AuthenticationResult(
-                success=False,
-                error_message="Invalid API key",
-            )
+        api_key_record = user = None
+        cached = self._api_key_cache.get(key_hash)
+        if cached is None:
+            # Find API key and its owner in database (one round-trip)
+            result = await db.execute(_ACTIVE_API_KEY_BY_HASH, {"key_hash": key_hash})
+            row = result.first()
+            if row is not None:
+                api_key_record, user = row
+
+            # The indexed lookup finds the candidate; confirm it in constant time
+            if not api_key_record or not hmac.compare_digest(
+                api_key_record.key_hash, key_hash
+            ):
+                logger.warning(f"API key authentication failed from {ip_address}")
+                return AuthenticationResult(
+                    success=False,
+                    error_message="Invalid API key",
+                )
+
+            cached = CachedAPIKey.from_api_key(api_key_record)
 
         # Check expiration
-        if api_key_record.expires_at and datetime.now(UTC) > api_key_record.expires_at:
-            safe_key_name = sanitize_for_logging(api_key_record.name)
-            logger.warning(f"Expired API key used: {safe_key_name}")
+        now = datetime.now(UTC)
+        if cached.expires_at and now > cached.expires_at:
+            logger.warning("Expired API key used: %s", Sanitized(cached.name))
             return AuthenticationResult(
                 success=False,
                 error_message="API key has expired",
             )
 
-        # Get associated user
-        user_stmt = select(User).where(User.id == api_key_record.created_by_user_id)
-        user_result = await db.execute(user_stmt)
-        user = user_result.scalar_one_or_none()
+        # Get associated user (already loaded unless served from cache)
+        if api_key_record is None:
+            user = await db.get(User, cached.user_id)
 
         if not user or not user.is_active:
-            safe_key_name = sanitize_for_logging(api_key_record.name)
-            logger.warning(f"API key associated with invalid user: {safe_key_name}")
+            logger.warning(
+                "API key associated with invalid user: %s",
+                Sanitized(cached.name),
+            )
             return AuthenticationResult(
                 success=False,
                 error_message="API key is invalid",
             )
 
-        # Update API key usage
-        api_key_record.last_used_at = datetime.now(UTC)
-        api_key_record.last_used_ip = ip_address
-        api_key_record.usage_count = (api_key_record.usage_count or 0) + 1
-        await db.commit()
+        self._api_key_cache.set(key_hash, cached)
+
+        # Update API key usage: batched in the background once the tracker
+        # is running, otherwise written now (atomic SQL increment)
+        usage_tracker = get_usage_tracker()
+        if usage_tracker.running:
+            usage_tracker.record(cached.id, now, ip_address)
+        else:
+            await db.execute(
+                update(APIKey)
+                .where(APIKey.id == cached.id)
+                .values(
+                    last_used_at=now,
+                    last_used_ip=ip_address,
+                    usage_count=func.coalesce(APIKey.usage_count, 0) + 1,
+                )
+            )
+            await db.commit()
 
-        safe_key_name = sanitize_for_logging(api_key_record.name)
-        logger.info(f"API key {safe_key_name} authenticated successfully")
+        logger.info("API key %s authenticated successfully", Sanitized(cached.name))
 
         return AuthenticationResult(
             success=True,
@@ -285,6 +346,31 @@ class AuthenticationManager:
             api_key=api_key_record,
         )
 
+    def invalidate_api_key(self, key_hash: str) -> None:
+        """
+        Drop a cached API key (call after revoking or deleting it).
+
+        Only this process's cache is affected; other workers keep serving
+        the key until their cached entry expires (30 seconds).
+
+        Args:
+            key_hash: Hash of the API key to invalidate
+        """
+        self._api_key_cache.pop(key_hash)
+
+    def invalidate_user_api_keys(self, user_id: int) -> None:
+        """
+        Drop cached API keys after a user is deactivated or deleted.
+
+        The cache is keyed by key hash, and user changes are rare, so the
+        whole cache is cleared rather than searched for the user's keys.
+
+        Args:
+            user_id: ID of the user whose keys should be invalidated
+        """
+        self._api_key_cache.clear()
+        logger.debug(f"API key cache cleared for user {user_id}")
+
     def validate_session(self, session_id: str) -> SessionData | None:
         """
         Validate a session ID.
@@ -319,6 +405,7 @@ class AuthenticationManager:
         Returns:
             Number of sessions invalidated
         """
+        get_user_cache().invalidate(user_id=user_id)
         return self.session_manager.invalidate_user_sessions(user_id)
 
     def validate_csrf_token(self, session_id: str, csrf_token: str) -> bool:
@@ -334,45 +421,18 @@ class AuthenticationManager:
         """
         return self.session_manager.validate_csrf_token(session_id, csrf_token)
 
-    def _is_account_locked(self, username: str) -> bool:
+    async def is_account_locked(self, username: str) -> bool:
         """Check if account is locked due to failed attempts."""
-        if username not in self._failed_attempts:
-            return False
+        attempts = await self._failed_attempts.count(username)
+        return attempts >= self.max_login_attempts
 
-        # Remove old attempts
-        cutoff_time = datetime.now(UTC) - timedelta(
-            minutes=self.lockout_duration_minutes
-        )
-        self._failed_attempts[username] = [
-            attempt
-            for attempt in self._failed_attempts[username]
-            if attempt > cutoff_time
-        ]
-
-        # Check if still locked
-        return len(self._failed_attempts[username]) >= self.max_login_attempts
-
-    def _record_failed_attempt(self, username: str) -> None:
+    async def record_failed_attempt(self, username: str) -> None:
         """Record a failed login attempt."""
-        if username not in self._failed_attempts:
-            self._failed_attempts[username] = []
-
-        self._failed_attempts[username].append(datetime.now(UTC))
-
-        # Keep only recent attempts
-        cutoff_time = datetime.now(UTC) - timedelta(
-            minutes=self.lockout_duration_minutes
-        )
-        self._failed_attempts[username] = [
-            attempt
-            for attempt in self._failed_attempts[username]
-            if attempt > cutoff_time
-        ]
+        await self._failed_attempts.increment(username)
 
-    def _clear_failed_attempts(self, username: str) -> None:
+    async def clear_failed_attempts(self, username: str) -> None:
         """Clear failed login attempts for a user."""
-        if username in self._failed_attempts:
-            del self._failed_attempts[username]
+        await self._failed_attempts.reset(username)
 
 
 # Global authentication manager instance
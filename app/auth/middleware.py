@@ -0,0 +1,110 @@
+# app/auth/middleware.py
+"""
+Harbor Authentication Middleware
+
+Resolves the web UI session once per request, before routing, so the
+authentication dependencies only have to read the result.
+"""
+
+import re
+from collections.abc import Iterable
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.auth.manager import get_auth_manager
+from app.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# Keys under scope["state"] (request.state) holding the resolved credentials
+SESSION_STATE_KEY = "auth_session"
+API_KEY_STATE_KEY = "auth_api_key"
+
+SESSION_COOKIE_NAME = "harbor_session"
+
+_SESSION_COOKIE_RE = re.compile(rf"(?:^|;)\s*{SESSION_COOKIE_NAME}=([^;]*)")
+
+
+def extract_session_cookie(cookie_header: str) -> str | None:
+    """
+    Extract the session ID from a raw Cookie header.
+
+    Only the session cookie is needed, so this skips building the full
+    cookie dict that starlette's cookie parsing allocates per request.
+
+    Args:
+        cookie_header: Value of the Cookie request header
+
+    Returns:
+        Session ID, or None if the cookie is missing or empty
+    """
+    match = _SESSION_COOKIE_RE.search(cookie_header)
+    if match is None:
+        return None
+    return match.group(1).strip() or None
+
+
+def extract_auth_headers(
+    headers: Iterable[tuple[bytes, bytes]],
+) -> tuple[str | None, str | None]:
+    """
+    Extract the session ID and API key from raw ASGI headers in one walk.
+
+    The API key comes from the X-API-Key header, falling back to a Bearer
+    token in the Authorization header.
+
+    Args:
+        headers: Raw (name, value) header pairs from the ASGI scope
+
+    Returns:
+        Tuple of (session_id, api_key), either of which may be None
+    """
+    session_id = authorization = x_api_key = None
+    for name, value in headers:
+        if name == b"cookie":
+            if session_id is None:
+                session_id = extract_session_cookie(value.decode("latin-1"))
+        elif name == b"authorization":
+            authorization = value
+        elif name == b"x-api-key":
+            x_api_key = value
+
+    if x_api_key:
+        return session_id, x_api_key.decode("latin-1")
+
+    api_key = None
+    if authorization:
+        scheme, _, credentials = authorization.decode("latin-1").partition(" ")
+        if scheme == "Bearer" and credentials:
+            api_key = credentials
+    return session_id, api_key
+
+
+class AuthSessionMiddleware:
+    """
+    Pure ASGI middleware that resolves request credentials up front.
+
+    Walks the raw scope headers once (no Request object), validates the
+    session cookie and stores the session, or None, in request state
+    along with the presented API key. Checking the API key stays in the
+    dependencies because it needs a database session.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize authentication middleware."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            session_id, api_key = extract_auth_headers(scope["headers"])
+
+            session = None
+            if session_id:
+                session = get_auth_manager().validate_session(session_id)
+
+            state = scope.setdefault("state", {})
+            state[SESSION_STATE_KEY] = session
+            state[API_KEY_STATE_KEY] = api_key
+
+        await self.app(scope, receive, send)
@@ -6,12 +6,18 @@ Secure password hashing and verification using argon2id.
 Implements OWASP best practices for password security.
 """
 
+import asyncio
+import functools
+import hashlib
+import os
 import secrets
+from concurrent.futures import ThreadPoolExecutor
 
 from argon2 import PasswordHasher
 from argon2.exceptions import InvalidHash, VerificationError, VerifyMismatchError
 
-from app.config import get_settings
+from app.config import DeploymentProfile, get_settings, on_settings_reload
+from app.utils.cache import TTLCache
 from app.utils.logging import get_logger
 
 
@@ -27,6 +33,83 @@ _password_hasher = PasswordHasher(
     salt_len=16,  # 16 byte salt
 )
 
+# Async callers run Argon2 on a small dedicated pool: the C code releases
+# the GIL so the event loop keeps serving requests, and since every hash
+# allocates 64MB the number in flight is capped rather than growing with
+# the default executor
+_argon2_executor = ThreadPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="argon2"
+)
+
+# Recent successful verifications, so repeated logins with the same
+# credentials skip the memory-hard Argon2 work. Keys are digests under a
+# per-process random key, so cached entries cannot be checked offline;
+# failures are never cached so guessing always pays the full cost.
+_VERIFY_CACHE_KEY = secrets.token_bytes(32)
+_verified_cache: TTLCache[bytes, bool] = TTLCache(maxsize=2048, ttl=30)
+
+
+def _verify_cache_key(password: str, hashed: str) -> bytes:
+    """Derive the verification cache key for a password/hash pair."""
+    # Encoded hashes never contain NUL, so the pair is unambiguous
+    return hashlib.blake2b(
+        hashed.encode() + b"\0" + password.encode(),
+        key=_VERIFY_CACHE_KEY,
+        digest_size=16,
+    ).digest()
+
+
+# Generated password alphabet, avoiding ambiguous characters (0/O, 1/l/I)
+_PASSWORD_CHARSET = "abcdefghijkmnopqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789!@#$%^&*"
+# Random bytes are mapped onto the alphabet with bytes.translate; bytes at or
+# above the largest multiple of its size are dropped to keep the choice uniform
+_CHARSET_TABLE = bytes(
+    ord(_PASSWORD_CHARSET[b % len(_PASSWORD_CHARSET)]) for b in range(256)
+)
+_CHARSET_REJECT = bytes(range(256 - 256 % len(_PASSWORD_CHARSET), 256))
+
+
+def _random_password_chars(length: int) -> str:
+    """Draw length uniformly random characters from the password alphabet."""
+    chars = b""
+    while len(chars) < length:
+        # About 3/4 of bytes are kept, so one draw almost always suffices
+        chars += secrets.token_bytes(2 * length).translate(
+            _CHARSET_TABLE, _CHARSET_REJECT
+        )
+    return chars[:length].decode("ascii")
+
+
+# Character class bits for password strength checks
+_LOWER, _UPPER, _DIGIT, _SPECIAL = 1, 2, 4, 8
+_SPECIAL_CHARS = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+_ASCII_CHAR_CLASSES = bytes(
+    (_LOWER if chr(i).islower() else 0)
+    | (_UPPER if chr(i).isupper() else 0)
+    | (_DIGIT if chr(i).isdigit() else 0)
+    | (_SPECIAL if chr(i) in _SPECIAL_CHARS else 0)
+    for i in range(128)
+)
+
+# Passwords rejected outright in production (compared case-insensitively)
+_COMMON_PASSWORDS = frozenset({"password", "admin", "harbor", "12345678", "qwerty"})
+
+
+def _char_classes(password: str) -> int:
+    """Get the character classes present in a password as a bitmask."""
+    classes = 0
+    for char in set(password):
+        if char.isascii():
+            classes |= _ASCII_CHAR_CLASSES[ord(char)]
+        else:
+            # Special characters are all ASCII; letters and digits may not be
+            classes |= (
+                (_LOWER if char.islower() else 0)
+                | (_UPPER if char.isupper() else 0)
+                | (_DIGIT if char.isdigit() else 0)
+            )
+    return classes
+
 
 class PasswordManager:
     """
@@ -36,11 +119,14 @@ class PasswordManager:
     based on deployment profile.
     """
 
+    __slots__ = ("is_production", "min_length", "require_special")
+
     def __init__(self):
         """Initialize password manager with configuration."""
-        self.settings = get_settings()
-        self.min_length = self.settings.security.password_min_length
-        self.require_special = self.settings.security.password_require_special
+        settings = get_settings()
+        self.min_length = settings.security.password_min_length
+        self.require_special = settings.security.password_require_special
+        self.is_production = settings.deployment_profile == DeploymentProfile.PRODUCTION
 
     def hash_password(self, password: str) -> str:
         """
@@ -70,6 +156,8 @@ class PasswordManager:
         """
         Verify a password against its hash.
 
+        Successful verifications are cached for a short time.
+
         Args:
             password: Plain text password to verify
             hashed: Hashed password to verify against
@@ -80,13 +168,18 @@ class PasswordManager:
         if not password or not hashed:
             return False
 
+        cache_key = _verify_cache_key(password, hashed)
+        if cache_key in _verified_cache:
+            return True
+
         try:
             _password_hasher.verify(hashed, password)
+            _verified_cache.set(cache_key, True)
 
-            # Check if rehashing is needed (argon2 parameters changed)
+            # Check if rehashing is needed (argon2 parameters changed); the
+            # login flow rehashes via needs_rehash() once it has the password
             if _password_hasher.check_needs_rehash(hashed):
                 logger.info("Password hash needs rehashing with updated parameters")
-                # Note: Actual rehashing would happen during login
 
             return True
 
@@ -107,6 +200,8 @@ class PasswordManager:
             Tuple of (is_valid, list_of_errors)
         """
         errors = []
+        # Classify every character in one pass
+        classes = _char_classes(password)
 
         # Check minimum length
         if len(password) < self.min_length:
@@ -115,28 +210,25 @@ class PasswordManager:
             )
 
         # Check for special characters if required
-        if self.require_special:
-            special_chars = "!@#$%^&*()_+-=[]{}|;:,.<>?"
-            if not any(char in special_chars for char in password):
-                errors.append("Password must contain at least one special character")
+        if self.require_special and not classes & _SPECIAL:
+            errors.append("Password must contain at least one special character")
 
         # Additional checks for production environments
-        if self.settings.deployment_profile.value == "production":
+        if self.is_production:
             # Check for uppercase
-            if not any(char.isupper() for char in password):
+            if not classes & _UPPER:
                 errors.append("Password must contain at least one uppercase letter")
 
             # Check for lowercase
-            if not any(char.islower() for char in password):
+            if not classes & _LOWER:
                 errors.append("Password must contain at least one lowercase letter")
 
             # Check for digits
-            if not any(char.isdigit() for char in password):
+            if not classes & _DIGIT:
                 errors.append("Password must contain at least one number")
 
             # Check against common passwords (basic check)
-            common_passwords = {"password", "admin", "harbor", "12345678", "qwerty"}
-            if password.lower() in common_passwords:
+            if password.casefold() in _COMMON_PASSWORDS:
                 errors.append("Password is too common")
 
         return len(errors) == 0, errors
@@ -151,22 +243,15 @@ class PasswordManager:
         Returns:
             Secure random password
         """
-        # Use a character set that avoids ambiguous characters
-        charset = "abcdefghijkmnopqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789!@#$%^&*"
-
         # Ensure minimum length
         length = max(length, self.min_length)
 
-        # Generate password
-        password = "".join(secrets.choice(charset) for _ in range(length))
-
-        # Ensure it meets requirements
-        valid, _ = self.validate_password_strength(password)
-        if not valid:
-            # Recursively generate until we get a valid one
-            return self.generate_secure_password(length)
-
-        return password
+        # Generate until the password meets requirements
+        while True:
+            password = _random_password_chars(length)
+            valid, _ = self.validate_password_strength(password)
+            if valid:
+                return password
 
     def needs_rehash(self, hashed: str) -> bool:
         """
@@ -196,6 +281,15 @@ def get_password_manager() -> PasswordManager:
     return _password_manager
 
 
+def _reset_password_manager() -> None:
+    """Drop the password manager so it is rebuilt from reloaded settings."""
+    global _password_manager
+    _password_manager = None
+
+
+on_settings_reload(_reset_password_manager)
+
+
 # Convenience functions
 def hash_password(password: str) -> str:
     """Hash a password using the global password manager."""
@@ -207,6 +301,25 @@ def verify_password(password: str, hashed: str) -> bool:
     return get_password_manager().verify_password(password, hashed)
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the Argon2 worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_argon2_executor, hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    """Verify a password on the Argon2 worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _argon2_executor, verify_password, password, hashed
+    )
+
+
+def needs_rehash(hashed: str) -> bool:
+    """Check if a password hash uses outdated parameters."""
+    return get_password_manager().needs_rehash(hashed)
+
+
 def validate_password(password: str) -> tuple[bool, list[str]]:
     """Validate password strength using the global password manager."""
     return get_password_manager().validate_password_strength(password)
@@ -215,3 +328,27 @@ def validate_password(password: str) -> tuple[bool, list[str]]:
 def generate_password(length: int = 16) -> str:
     """Generate a secure password using the global password manager."""
     return get_password_manager().generate_secure_password(length)
+
+
+@functools.cache
+def dummy_password_hash() -> str:
+    """
+    Get a throwaway password hash for timing-safe failed logins.
+
+    Verifying against it when a user is missing or disabled takes as long
+    as a real verification. It uses the same Argon2 parameters as real
+    hashes on purpose: verification time follows the hash's parameters,
+    so a cheaper decoy would reintroduce the timing difference.
+    Computed on first use rather than at import to keep startup fast.
+    """
+    return hash_password(secrets.token_urlsafe(16))
+
+
+def warm_up_password_hashing() -> None:
+    """
+    Compute the dummy hash on the Argon2 worker pool in the background.
+
+    Call at startup: it moves the one-time Argon2 load and memory setup,
+    and the dummy hash itself, off the first login without delaying startup.
+    """
+    _argon2_executor.submit(dummy_password_hash)
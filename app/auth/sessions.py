@@ -4,16 +4,35 @@ Harbor Session Management
 Secure session handling with HTTP-only cookies and CSRF protection.
 """
 
+import base64
+import heapq
+import math
 import secrets
+import time
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
+from app.auth.csrf import CSRF_TOKEN_BYTES, get_csrf_protection
 from app.config import get_settings
-from app.utils.logging import get_logger
+from app.utils.logging import Sanitized, get_logger
 
 
 logger = get_logger(__name__)
 
+# Random bytes in a session ID (encodes to 43 URL-safe characters)
+SESSION_ID_BYTES = 32
+
+
+def _generate_session_tokens() -> tuple[str, str]:
+    """Generate a session ID and CSRF token from a single random draw."""
+    raw = secrets.token_bytes(SESSION_ID_BYTES + CSRF_TOKEN_BYTES)
+    # Same encoding as secrets.token_urlsafe
+    encode = base64.urlsafe_b64encode
+    return (
+        encode(raw[:SESSION_ID_BYTES]).rstrip(b"=").decode("ascii"),
+        encode(raw[SESSION_ID_BYTES:]).rstrip(b"=").decode("ascii"),
+    )
+
 
 class SessionData:
     """Container for session data."""
@@ -38,39 +57,67 @@ class SessionData:
         self.is_admin = is_admin
         self.csrf_token = csrf_token or self._generate_csrf_token()
         self.created_at = created_at or datetime.now(UTC)
-        self.expires_at = expires_at
-        self.last_activity = last_activity or datetime.now(UTC)
+        # Times checked on every request are kept as epoch seconds so the
+        # hot path compares floats instead of building datetimes
+        self._expires_epoch = expires_at.timestamp() if expires_at else math.inf
+        self._last_activity_epoch = (
+            last_activity.timestamp() if last_activity else time.time()
+        )
         self.ip_address = ip_address
         self.user_agent = user_agent
 
     @staticmethod
     def _generate_csrf_token() -> str:
         """Generate a secure CSRF token."""
-        return secrets.token_urlsafe(32)
+        return secrets.token_urlsafe(CSRF_TOKEN_BYTES)
 
-    def is_expired(self) -> bool:
-        """Check if session has expired."""
-        if self.expires_at is None:
-            return False
-        return datetime.now(UTC) > self.expires_at
+    @property
+    def expires_at(self) -> datetime | None:
+        """Expiration time, or None if the session does not expire."""
+        if self._expires_epoch == math.inf:
+            return None
+        return datetime.fromtimestamp(self._expires_epoch, UTC)
+
+    @expires_at.setter
+    def expires_at(self, value: datetime | None) -> None:
+        self._expires_epoch = value.timestamp() if value else math.inf
+
+    @property
+    def last_activity(self) -> datetime:
+        """Time of the last request made with this session."""
+        return datetime.fromtimestamp(self._last_activity_epoch, UTC)
+
+    @last_activity.setter
+    def last_activity(self, value: datetime) -> None:
+        self._last_activity_epoch = value.timestamp()
+
+    def is_expired(self, now: float | None = None) -> bool:
+        """
+        Check if session has expired.
+
+        Args:
+            now: Current epoch time, to share one clock reading across sessions
+        """
+        return (time.time() if now is None else now) > self._expires_epoch
 
     def update_activity(self) -> None:
         """Update last activity timestamp."""
-        self.last_activity = datetime.now(UTC)
+        self._last_activity_epoch = time.time()
 
     def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary for storage."""
+        """Convert to dictionary for storage (times as epoch seconds)."""
         return {
+            "v": 2,
             "session_id": self.session_id,
             "user_id": self.user_id,
             "username": self.username,
             "is_admin": self.is_admin,
             "csrf_token": self.csrf_token,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
-            "last_activity": self.last_activity.isoformat()
-            if self.last_activity
-            else None,
+            "created_at": self.created_at.timestamp(),
+            "expires_at": None
+            if self._expires_epoch == math.inf
+            else self._expires_epoch,
+            "last_activity": self._last_activity_epoch,
             "ip_address": self.ip_address,
             "user_agent": self.user_agent,
         }
@@ -78,6 +125,27 @@ class SessionData:
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "SessionData":
         """Create from dictionary."""
+        if data.get("v") != 2:
+            return cls._from_isoformat_dict(data)
+
+        session = cls(
+            session_id=data["session_id"],
+            user_id=data["user_id"],
+            username=data["username"],
+            is_admin=data.get("is_admin", False),
+            csrf_token=data.get("csrf_token"),
+            created_at=datetime.fromtimestamp(data["created_at"], UTC),
+            ip_address=data.get("ip_address"),
+            user_agent=data.get("user_agent"),
+        )
+        expires_epoch = data.get("expires_at")
+        session._expires_epoch = math.inf if expires_epoch is None else expires_epoch
+        session._last_activity_epoch = data["last_activity"]
+        return session
+
+    @classmethod
+    def _from_isoformat_dict(cls, data: dict[str, Any]) -> "SessionData":
+        """Create from a dictionary written before times were stored as epochs."""
         return cls(
             session_id=data["session_id"],
             user_id=data["user_id"],
@@ -111,6 +179,9 @@ class SessionManager:
         self.settings = get_settings()
         self._sessions: dict[str, SessionData] = {}
         self._user_sessions: dict[int, set[str]] = {}  # Track sessions per user
+        # (expires_epoch, session_id) min-heap so cleanup only visits sessions
+        # that are due; entries are checked against the session when popped
+        self._expiry_heap: list[tuple[float, str]] = []
 
     def create_session(
         self,
@@ -135,8 +206,8 @@ class SessionManager:
         Returns:
             Created session data
         """
-        # Generate secure session ID
-        session_id = secrets.token_urlsafe(32)
+        # Generate secure session ID and CSRF token
+        session_id, csrf_token = _generate_session_tokens()
 
         # Calculate expiration
         timeout_hours = self.settings.security.session_timeout_hours
@@ -152,6 +223,7 @@ class SessionManager:
             user_id=user_id,
             username=username,
             is_admin=is_admin,
+            csrf_token=csrf_token,
             expires_at=expires_at,
             ip_address=ip_address,
             user_agent=user_agent,
@@ -159,6 +231,7 @@ class SessionManager:
 
         # Store session
         self._sessions[session_id] = session
+        heapq.heappush(self._expiry_heap, (session._expires_epoch, session_id))
 
         # Track user's sessions
         if user_id not in self._user_sessions:
@@ -168,7 +241,9 @@ class SessionManager:
         # Clean up old sessions for this user (max 5 concurrent sessions)
         self._cleanup_user_sessions(user_id, max_sessions=5)
 
-        logger.info(f"Session created for user {username} (ID: {user_id})")
+        logger.info(
+            "Session created for user %s (ID: %s)", Sanitized(username), user_id
+        )
         return session
 
     def get_session(self, session_id: str) -> SessionData | None:
@@ -218,7 +293,7 @@ class SessionManager:
                 if not self._user_sessions[session.user_id]:
                     del self._user_sessions[session.user_id]
 
-            logger.info(f"Session invalidated for user {session.username}")
+            logger.info("Session invalidated for user %s", Sanitized(session.username))
             return True
 
         return False
@@ -233,16 +308,17 @@ class SessionManager:
         Returns:
             Number of sessions invalidated
         """
-        if user_id not in self._user_sessions:
+        # Take the user's whole set at once, then drop each session
+        session_ids = self._user_sessions.pop(user_id, None)
+        if not session_ids:
             return 0
 
-        session_ids = list(self._user_sessions[user_id])
         count = 0
-
         for session_id in session_ids:
-            if self.invalidate_session(session_id):
+            if self._sessions.pop(session_id, None) is not None:
                 count += 1
 
+        logger.info(f"Invalidated {count} sessions for user {user_id}")
         return count
 
     def validate_csrf_token(self, session_id: str, csrf_token: str) -> bool:
@@ -261,7 +337,7 @@ class SessionManager:
         if session is None:
             return False
 
-        return secrets.compare_digest(session.csrf_token, csrf_token)
+        return get_csrf_protection().validate_token(csrf_token, session.csrf_token)
 
     def refresh_session(self, session_id: str) -> SessionData | None:
         """
@@ -279,7 +355,7 @@ class SessionManager:
             timeout_hours = self.settings.security.session_timeout_hours
             session.expires_at = datetime.now(UTC) + timedelta(hours=timeout_hours)
             session.update_activity()
-            logger.debug(f"Session refreshed for user {session.username}")
+            logger.debug("Session refreshed for user %s", Sanitized(session.username))
             return session
 
         return None
@@ -300,19 +376,21 @@ class SessionManager:
         if len(user_session_ids) <= max_sessions:
             return
 
-        # Get all user's sessions with timestamps
-        sessions_with_time = []
-        for sid in user_session_ids:
-            if sid in self._sessions:
-                session = self._sessions[sid]
-                sessions_with_time.append((sid, session.created_at))
+        # Skip stale IDs whose session is already gone
+        live_session_ids = [sid for sid in user_session_ids if sid in self._sessions]
+        sessions_to_remove = len(live_session_ids) - max_sessions
+        if sessions_to_remove <= 0:
+            return
 
-        # Sort by creation time (oldest first)
-        sessions_with_time.sort(key=lambda x: x[1])
+        # Select only the oldest sessions over the limit (no full sort)
+        oldest = heapq.nsmallest(
+            sessions_to_remove,
+            live_session_ids,
+            key=lambda sid: self._sessions[sid].created_at,
+        )
 
         # Remove oldest sessions
-        sessions_to_remove = len(sessions_with_time) - max_sessions
-        for sid, _ in sessions_with_time[:sessions_to_remove]:
+        for sid in oldest:
             self.invalidate_session(sid)
 
         logger.info(f"Cleaned up {sessions_to_remove} old sessions for user {user_id}")
@@ -321,22 +399,43 @@ class SessionManager:
         """
         Clean up all expired sessions.
 
+        Only sessions whose queued expiry has passed are visited. A session
+        whose expiry was moved earlier after creation is still rejected by
+        get_session, but is only swept here once its queued time passes.
+
         Returns:
             Number of sessions cleaned up
         """
-        expired_sessions = []
-
-        for session_id, session in self._sessions.items():
-            if session.is_expired():
-                expired_sessions.append(session_id)
-
-        for session_id in expired_sessions:
-            self.invalidate_session(session_id)
-
-        if expired_sessions:
-            logger.info(f"Cleaned up {len(expired_sessions)} expired sessions")
-
-        return len(expired_sessions)
+        now = time.time()
+        heap = self._expiry_heap
+        expired_count = 0
+
+        # Strictly earlier: is_expired() treats an expiry equal to now as valid
+        while heap and heap[0][0] < now:
+            _, session_id = heapq.heappop(heap)
+            session = self._sessions.get(session_id)
+            if session is None:
+                # Already invalidated
+                continue
+            if session.is_expired(now):
+                self.invalidate_session(session_id)
+                expired_count += 1
+            else:
+                # Refreshed since it was queued; requeue at its new expiry
+                heapq.heappush(heap, (session._expires_epoch, session_id))
+
+        # Drop entries left behind by invalidated sessions once they pile up
+        if len(heap) > 2 * len(self._sessions) + 64:
+            self._expiry_heap = [
+                (session._expires_epoch, session_id)
+                for session_id, session in self._sessions.items()
+            ]
+            heapq.heapify(self._expiry_heap)
+
+        if expired_count:
+            logger.info(f"Cleaned up {expired_count} expired sessions")
+
+        return expired_count
 
     def get_session_count(self) -> int:
         """Get total number of active sessions."""
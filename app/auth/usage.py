@@ -0,0 +1,151 @@
+# app/auth/usage.py
+"""
+Harbor API Key Usage Tracking
+
+Coalesces API key usage updates in memory and writes them to the database
+in periodic batches, so authenticated API requests don't each commit a write.
+"""
+
+import asyncio
+import contextlib
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, update
+
+from app.db.models.api_key import APIKey
+from app.db.session import get_async_session
+from app.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+@dataclass(slots=True)
+class _PendingUsage:
+    """Usage accumulated for one API key since the last flush."""
+
+    count: int
+    last_used_at: datetime
+    last_used_ip: str | None
+
+
+class APIKeyUsageTracker:
+    """
+    Batches API key usage counters and last-used details.
+
+    Usage is recorded in memory and flushed by a background task started
+    with the application. Until the task is running, callers should write
+    usage directly (see ``running``).
+    """
+
+    def __init__(self, flush_interval: float = 1.0) -> None:
+        """
+        Initialize usage tracker.
+
+        Args:
+            flush_interval: Seconds between batched database writes
+        """
+        self.flush_interval = flush_interval
+        self._pending: dict[int, _PendingUsage] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._stopping: asyncio.Event | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background flush task is active."""
+        return self._task is not None and not self._task.done()
+
+    def record(
+        self, api_key_id: int, used_at: datetime, ip_address: str | None
+    ) -> None:
+        """
+        Record one use of an API key.
+
+        Args:
+            api_key_id: ID of the API key used
+            used_at: Time of use
+            ip_address: Client IP address
+        """
+        pending = self._pending.get(api_key_id)
+        if pending is None:
+            self._pending[api_key_id] = _PendingUsage(1, used_at, ip_address)
+        else:
+            pending.count += 1
+            pending.last_used_at = used_at
+            pending.last_used_ip = ip_address
+
+    async def flush(self) -> int:
+        """
+        Write all pending usage in a single batched UPDATE.
+
+        Returns:
+            Number of API keys updated
+        """
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        table = APIKey.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(
+                usage_count=func.coalesce(table.c.usage_count, 0)
+                + bindparam("b_count"),
+                last_used_at=bindparam("b_last_used_at"),
+                last_used_ip=bindparam("b_last_used_ip"),
+            )
+        )
+        params = [
+            {
+                "b_id": api_key_id,
+                "b_count": usage.count,
+                "b_last_used_at": usage.last_used_at,
+                "b_last_used_ip": usage.last_used_ip,
+            }
+            for api_key_id, usage in pending.items()
+        ]
+
+        try:
+            async with get_async_session() as session:
+                await session.execute(stmt, params)
+        except Exception as e:
+            logger.error(f"Failed to write usage for {len(params)} API keys: {e}")
+            return 0
+
+        return len(params)
+
+    def start(self) -> None:
+        """Start the background flush task."""
+        if not self.running:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._flush_periodically(self._stopping))
+
+    async def stop(self) -> None:
+        """Stop the background flush task and write any remaining usage."""
+        if self._task is not None and self._stopping is not None:
+            # Let the task finish its final flush rather than cancelling it
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _flush_periodically(self, stopping: asyncio.Event) -> None:
+        """Flush pending usage every flush_interval seconds until stopped."""
+        while not stopping.is_set():
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(stopping.wait(), self.flush_interval)
+            await self.flush()
+
+
+# Global usage tracker instance
+_usage_tracker: APIKeyUsageTracker | None = None
+
+
+def get_usage_tracker() -> APIKeyUsageTracker:
+    """Get the global API key usage tracker instance."""
+    global _usage_tracker
+    if _usage_tracker is None:
+        _usage_tracker = APIKeyUsageTracker()
+    return _usage_tracker
@@ -0,0 +1,164 @@
+# app/auth/user_cache.py
+"""
+Harbor Authentication User Cache
+
+In-process cache of the user fields needed for authentication, so repeated
+logins do not issue a SELECT and hydrate a full ORM row every time.
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+
+from app.db.models.user import User
+from app.utils.cache import TTLCache
+from app.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CachedUser:
+    """
+    Immutable snapshot of the user fields needed for authentication.
+
+    Detached from the SQLAlchemy session, so it is safe to share between
+    requests and never triggers lazy loads.
+    """
+
+    id: int
+    username: str
+    password_hash: str
+    is_admin: bool
+    is_active: bool
+    display_name: str | None
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        """Create a snapshot from a user row."""
+        return cls(
+            id=user.id,
+            username=user.username,
+            password_hash=user.password_hash,
+            is_admin=user.is_admin,
+            is_active=user.is_active,
+            display_name=user.display_name,
+        )
+
+
+class UserCache:
+    """
+    TTL cache of authentication snapshots indexed by username and user ID.
+
+    Entries must be invalidated whenever credentials or account status
+    change (password change, logout of all sessions, user creation);
+    UserRepository does this for its updates. Writes made by other
+    processes (workers, the reset-admin CLI) cannot invalidate this
+    cache, so the TTL is kept to seconds to bound how long they go unseen.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 5) -> None:
+        """Initialize user cache."""
+        self._by_username: TTLCache[str, CachedUser] = TTLCache(maxsize, ttl)
+        self._by_id: TTLCache[int, CachedUser] = TTLCache(maxsize, ttl)
+
+    def get_by_username(self, username: str) -> CachedUser | None:
+        """Get cached user by username (exact match, like the query)."""
+        return self._by_username.get(username)
+
+    def get_by_id(self, user_id: int) -> CachedUser | None:
+        """Get cached user by ID."""
+        return self._by_id.get(user_id)
+
+    def put(self, user: CachedUser) -> None:
+        """Cache a user snapshot under both indexes."""
+        self._by_username.set(user.username, user)
+        self._by_id.set(user.id, user)
+
+    def invalidate(
+        self, user_id: int | None = None, username: str | None = None
+    ) -> None:
+        """
+        Drop cached entries for a user.
+
+        Either identifier is enough; the other index is cleaned up using
+        the cached snapshot.
+
+        Args:
+            user_id: User ID to invalidate
+            username: Username to invalidate
+        """
+        if user_id is not None:
+            cached = self._by_id.pop(user_id)
+            if cached is not None:
+                self._by_username.pop(cached.username)
+
+        if username is not None:
+            cached = self._by_username.pop(username)
+            if cached is not None:
+                self._by_id.pop(cached.id)
+
+    def clear(self) -> None:
+        """Drop all cached users."""
+        self._by_username.clear()
+        self._by_id.clear()
+
+
+# Global user cache instance
+_user_cache: UserCache | None = None
+
+
+def get_user_cache() -> UserCache:
+    """Get the global user cache instance."""
+    global _user_cache
+    if _user_cache is None:
+        _user_cache = UserCache()
+    return _user_cache
+
+
+async def get_user_cached(db: AsyncSession, username: str) -> CachedUser | None:
+    """
+    Get an authentication snapshot for a username.
+
+    Serves from the in-process cache when possible and falls back to the
+    database on a miss. Missing users are not cached so newly created
+    accounts are visible immediately.
+
+    Args:
+        db: Database session
+        username: Username to look up
+
+    Returns:
+        User snapshot, or None if the user does not exist
+    """
+    cache = get_user_cache()
+    cached = cache.get_by_username(username)
+    if cached is not None:
+        return cached
+
+    # Load only the columns the snapshot needs (skips preference/metadata blobs)
+    stmt = (
+        select(User)
+        .options(
+            load_only(
+                User.id,
+                User.username,
+                User.password_hash,
+                User.is_admin,
+                User.is_active,
+                User.display_name,
+            )
+        )
+        .where(User.username == username)
+    )
+    result = await db.execute(stmt)
+    user = result.scalar_one_or_none()
+    if user is None:
+        return None
+
+    cached = CachedUser.from_user(user)
+    cache.put(cached)
+    return cached
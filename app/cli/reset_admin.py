@@ -6,6 +6,7 @@ import asyncio
 from sqlalchemy import select
 
 from app.auth.password import generate_password, hash_password
+from app.auth.user_cache import get_user_cache
 from app.db.models.user import User
 from app.db.session import get_async_session
 
@@ -35,6 +36,10 @@ async def reset_admin_password():
 
         await session.commit()
 
+        # Running servers keep their own user cache; they pick up the new
+        # password once its short TTL expires.
+        get_user_cache().invalidate(admin.id, admin.username)
+
         print("✅ Admin password reset")
         print(f"   New password: {new_password}")
 
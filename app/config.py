@@ -10,6 +10,7 @@ variable caching issues.
 import os
 import platform
 import sys
+from collections.abc import Callable
 from enum import Enum
 from pathlib import Path
 from typing import Any
@@ -64,6 +65,13 @@ class DatabaseType(str, Enum):
     POSTGRESQL = "postgresql"
 
 
+class AuthStateBackend(str, Enum):
+    """Where shared authentication state (failed logins) is kept"""
+
+    MEMORY = "memory"  # Per process
+    REDIS = "redis"  # Shared between workers
+
+
 # =============================================================================
 # Environment Variable Reader - THE CORE FIX
 # =============================================================================
@@ -143,23 +151,53 @@ env = EnvironmentReader()
 # =============================================================================
 
 
-class DatabaseSettings(BaseSettings):
-    """Database configuration settings - uses factory pattern"""
+class FactorySettings(BaseSettings):
+    """
+    Base for settings populated by the factory functions below.
 
-    database_type: DatabaseType
-    database_url: str | None
-    sqlite_path: Path | None
-    pool_size: int
-    max_overflow: int
-    pool_timeout: int
+    The factories read every value from the environment themselves, so
+    the pydantic-settings environment and dotenv sources are disabled;
+    scanning them again for each nested model dominated construction time.
+    """
 
     if PYDANTIC_V2:
         model_config = SettingsConfigDict(extra="ignore")
+
+        @classmethod
+        def settings_customise_sources(
+            cls,
+            settings_cls: type[BaseSettings],
+            init_settings: Any,
+            env_settings: Any,
+            dotenv_settings: Any,
+            file_secret_settings: Any,
+        ) -> tuple[Any, ...]:
+            """Only use the values passed in by the factory"""
+            return (init_settings,)
+
     else:
 
         class Config:
             extra = "ignore"
 
+            @classmethod
+            def customise_sources(
+                cls, init_settings: Any, env_settings: Any, file_secret_settings: Any
+            ) -> tuple[Any, ...]:
+                """Only use the values passed in by the factory"""
+                return (init_settings,)
+
+
+class DatabaseSettings(FactorySettings):
+    """Database configuration settings - uses factory pattern"""
+
+    database_type: DatabaseType
+    database_url: str | None
+    sqlite_path: Path | None
+    pool_size: int
+    max_overflow: int
+    pool_timeout: int
+
 
 def create_database_settings() -> DatabaseSettings:
     """Factory function for DatabaseSettings"""
@@ -177,7 +215,7 @@ def create_database_settings() -> DatabaseSettings:
     )
 
 
-class SecuritySettings(BaseSettings):
+class SecuritySettings(FactorySettings):
     """Security configuration settings - uses factory pattern"""
 
     require_https: bool
@@ -186,39 +224,29 @@ class SecuritySettings(BaseSettings):
     api_rate_limit_per_hour: int
     password_min_length: int
     password_require_special: bool
+    auth_state_backend: AuthStateBackend
+    redis_url: str
 
-    if PYDANTIC_V2:
-        model_config = SettingsConfigDict(extra="ignore")
-    else:
 
-        class Config:
-            extra = "ignore"
+# Profile-specific defaults:
+# (require_https, session_timeout_hours, password_min_length, require_special)
+_SECURITY_PROFILE_DEFAULTS: dict[DeploymentProfile, tuple[bool, int, int, bool]] = {
+    DeploymentProfile.HOMELAB: (False, 168, 6, False),  # 1 week sessions
+    DeploymentProfile.DEVELOPMENT: (False, 72, 6, False),  # 3 days
+    DeploymentProfile.STAGING: (True, 24, 8, True),  # 1 day
+    DeploymentProfile.PRODUCTION: (True, 8, 12, True),  # 8 hours
+}
 
 
 def create_security_settings(profile: DeploymentProfile) -> SecuritySettings:
     """Factory function for SecuritySettings with profile-aware defaults"""
 
-    # Profile-specific defaults
-    if profile == DeploymentProfile.HOMELAB:
-        default_https = False
-        default_session_timeout = 168  # 1 week
-        default_password_length = 6
-        default_require_special = False
-    elif profile == DeploymentProfile.DEVELOPMENT:
-        default_https = False
-        default_session_timeout = 72  # 3 days
-        default_password_length = 6
-        default_require_special = False
-    elif profile == DeploymentProfile.STAGING:
-        default_https = True
-        default_session_timeout = 24  # 1 day
-        default_password_length = 8
-        default_require_special = True
-    else:  # PRODUCTION
-        default_https = True
-        default_session_timeout = 8  # 8 hours
-        default_password_length = 12
-        default_require_special = True
+    (
+        default_https,
+        default_session_timeout,
+        default_password_length,
+        default_require_special,
+    ) = _SECURITY_PROFILE_DEFAULTS[profile]
 
     return SecuritySettings(
         require_https=env.read_bool("HARBOR_REQUIRE_HTTPS", default_https),
@@ -235,10 +263,14 @@ def create_security_settings(profile: DeploymentProfile) -> SecuritySettings:
         password_require_special=env.read_bool(
             "HARBOR_SECURITY_PASSWORD_REQUIRE_SPECIAL", default_require_special
         ),
+        auth_state_backend=env.read_enum(
+            "HARBOR_AUTH_STATE_BACKEND", AuthStateBackend, AuthStateBackend.MEMORY
+        ),
+        redis_url=env.read_str("HARBOR_REDIS_URL", "redis://localhost:6379/0"),
     )
 
 
-class LoggingSettings(BaseSettings):
+class LoggingSettings(FactorySettings):
     """Logging configuration settings - uses factory pattern"""
 
     log_level: LogLevel
@@ -246,27 +278,20 @@ class LoggingSettings(BaseSettings):
     log_retention_days: int
     enable_file_logging: bool
 
-    if PYDANTIC_V2:
-        model_config = SettingsConfigDict(extra="ignore")
-    else:
 
-        class Config:
-            extra = "ignore"
+# Profile-specific defaults: (log_level, log_retention_days)
+_LOGGING_PROFILE_DEFAULTS: dict[DeploymentProfile, tuple[LogLevel, int]] = {
+    DeploymentProfile.HOMELAB: (LogLevel.INFO, 14),
+    DeploymentProfile.DEVELOPMENT: (LogLevel.DEBUG, 7),
+    DeploymentProfile.STAGING: (LogLevel.INFO, 14),
+    DeploymentProfile.PRODUCTION: (LogLevel.INFO, 90),
+}
 
 
 def create_logging_settings(profile: DeploymentProfile) -> LoggingSettings:
     """Factory function for LoggingSettings with profile-aware defaults"""
 
-    # Profile-specific defaults
-    if profile == DeploymentProfile.DEVELOPMENT:
-        default_level = LogLevel.DEBUG
-        default_retention = 7
-    elif profile == DeploymentProfile.PRODUCTION:
-        default_level = LogLevel.INFO
-        default_retention = 90
-    else:
-        default_level = LogLevel.INFO
-        default_retention = 14
+    default_level, default_retention = _LOGGING_PROFILE_DEFAULTS[profile]
 
     return LoggingSettings(
         log_level=env.read_enum("HARBOR_LOG_LOG_LEVEL", LogLevel, default_level),
@@ -276,7 +301,7 @@ def create_logging_settings(profile: DeploymentProfile) -> LoggingSettings:
     )
 
 
-class FeatureSettings(BaseSettings):
+class FeatureSettings(FactorySettings):
     """Feature flag settings - uses factory pattern"""
 
     enable_auto_discovery: bool
@@ -287,13 +312,6 @@ class FeatureSettings(BaseSettings):
     enable_notifications: bool
     enable_rbac: bool
 
-    if PYDANTIC_V2:
-        model_config = SettingsConfigDict(extra="ignore")
-    else:
-
-        class Config:
-            extra = "ignore"
-
 
 def create_feature_settings(profile: DeploymentProfile) -> FeatureSettings:
     """Factory function for FeatureSettings with profile-aware defaults"""
@@ -315,7 +333,7 @@ def create_feature_settings(profile: DeploymentProfile) -> FeatureSettings:
     )
 
 
-class UpdateSettings(BaseSettings):
+class UpdateSettings(FactorySettings):
     """Update configuration settings - uses factory pattern"""
 
     default_check_interval_seconds: int
@@ -324,24 +342,20 @@ class UpdateSettings(BaseSettings):
     default_cleanup_keep_images: int
     update_timeout_seconds: int
 
-    if PYDANTIC_V2:
-        model_config = SettingsConfigDict(extra="ignore")
-    else:
 
-        class Config:
-            extra = "ignore"
+# Profile-specific default for max_concurrent_updates
+_UPDATE_PROFILE_DEFAULTS: dict[DeploymentProfile, int] = {
+    DeploymentProfile.HOMELAB: 2,
+    DeploymentProfile.DEVELOPMENT: 2,
+    DeploymentProfile.STAGING: 5,
+    DeploymentProfile.PRODUCTION: 10,
+}
 
 
 def create_update_settings(profile: DeploymentProfile) -> UpdateSettings:
     """Factory function for UpdateSettings with profile-aware defaults"""
 
-    # Profile-specific defaults
-    if profile == DeploymentProfile.HOMELAB or profile == DeploymentProfile.DEVELOPMENT:
-        default_concurrent = 2
-    elif profile == DeploymentProfile.STAGING:
-        default_concurrent = 5
-    else:  # PRODUCTION
-        default_concurrent = 10
+    default_concurrent = _UPDATE_PROFILE_DEFAULTS[profile]
 
     return UpdateSettings(
         default_check_interval_seconds=env.read_int(
@@ -363,7 +377,12 @@ def create_update_settings(profile: DeploymentProfile) -> UpdateSettings:
 # =============================================================================
 
 
-class HarborSettings(BaseSettings):
+# Resolved (data_dir, logs_dir) pairs already created by this process.
+# Resolving keeps relative paths correct if the working directory changes
+_ensured_directories: set[tuple[Path, Path]] = set()
+
+
+class HarborSettings(FactorySettings):
     """Main Harbor configuration settings - FACTORY PATTERN APPROACH"""
 
     # Application metadata
@@ -384,13 +403,6 @@ class HarborSettings(BaseSettings):
     features: FeatureSettings
     updates: UpdateSettings
 
-    if PYDANTIC_V2:
-        model_config = SettingsConfigDict(extra="ignore")
-    else:
-
-        class Config:
-            extra = "ignore"
-
     def __post_init__(self) -> None:
         """Apply final validation and setup"""
         self._ensure_data_directory()
@@ -398,9 +410,15 @@ class HarborSettings(BaseSettings):
 
     def _ensure_data_directory(self) -> None:
         """Ensure data directory exists"""
+        # Settings are rebuilt on every reload; only touch new directories
+        directories = (self.data_dir.resolve(), self.logs_dir.resolve())
+        if directories in _ensured_directories:
+            return
+
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.logs_dir.mkdir(parents=True, exist_ok=True)
         (self.data_dir / "backups").mkdir(exist_ok=True)
+        _ensured_directories.add(directories)
 
     def _validate_configuration(self) -> None:
         """Validate configuration settings"""
@@ -528,9 +546,20 @@ def create_harbor_settings() -> HarborSettings:
 class SettingsManager:
     """Settings manager that properly handles environment changes"""
 
+    # Environment variables whose changes trigger a settings rebuild
+    _WATCHED_ENV_VARS = (
+        "HARBOR_MODE",
+        "HARBOR_DEBUG",
+        "HARBOR_SECURITY_PASSWORD_MIN_LENGTH",
+        "HARBOR_UPDATE_MAX_CONCURRENT_UPDATES",
+        "HARBOR_LOG_LOG_LEVEL",
+        "DATABASE_URL",
+        "TESTING",
+    )
+
     def __init__(self) -> None:
         self._cached_settings: HarborSettings | None = None
-        self._env_snapshot: dict[str, str | None] | None = None
+        self._env_snapshot: tuple[str | None, ...] | None = None
 
     def get_settings(self, force_reload: bool = False) -> HarborSettings:
         """Get settings with proper environment change detection"""
@@ -553,6 +582,7 @@ class SettingsManager:
             logger.debug(
                 f"Created settings with profile: {self._cached_settings.deployment_profile.value}"
             )
+            _notify_reload_listeners()
 
         return self._cached_settings
 
@@ -561,20 +591,33 @@ class SettingsManager:
         self._cached_settings = None
         self._env_snapshot = None
         logger.debug("Settings cache cleared")
+        _notify_reload_listeners()
 
-    def _get_env_snapshot(self) -> dict[str, str | None]:
+    def _get_env_snapshot(self) -> tuple[str | None, ...]:
         """Get snapshot of relevant environment variables"""
-        env_vars = [
-            "HARBOR_MODE",
-            "HARBOR_DEBUG",
-            "HARBOR_SECURITY_PASSWORD_MIN_LENGTH",
-            "HARBOR_UPDATE_MAX_CONCURRENT_UPDATES",
-            "HARBOR_LOG_LOG_LEVEL",
-            "DATABASE_URL",
-            "TESTING",
-        ]
+        # Runs on every get_settings() call: a tuple built and compared in C
+        return tuple(map(os.environ.get, self._WATCHED_ENV_VARS))
+
+
+# Callbacks invoked whenever settings are rebuilt or the cache is cleared
+_reload_listeners: list[Callable[[], None]] = []
+
+
+def on_settings_reload(listener: Callable[[], None]) -> Callable[[], None]:
+    """
+    Register a callback to run whenever settings are reloaded.
+
+    Lets modules cache values derived from settings and drop them when
+    the configuration changes. Can be used as a decorator.
+    """
+    _reload_listeners.append(listener)
+    return listener
 
-        return {var: os.getenv(var) for var in env_vars}
+
+def _notify_reload_listeners() -> None:
+    """Invoke all registered settings reload callbacks"""
+    for listener in _reload_listeners:
+        listener()
 
 
 # Global settings manager
@@ -613,10 +656,24 @@ def create_fresh_settings() -> HarborSettings:
 # =============================================================================
 
 
+# Summary built for the current settings instance, rebuilt after a reload
+_config_summary: tuple[HarborSettings, dict[str, Any]] | None = None
+
+
 def get_config_summary() -> dict[str, Any]:
     """Get configuration summary for debugging/status"""
+    global _config_summary
     settings = get_settings()
 
+    if _config_summary is None or _config_summary[0] is not settings:
+        _config_summary = (settings, _build_config_summary(settings))
+
+    # Callers may add keys to the summary, so hand out a copy
+    return dict(_config_summary[1])
+
+
+def _build_config_summary(settings: HarborSettings) -> dict[str, Any]:
+    """Build the configuration summary for a settings instance"""
     return {
         "deployment_profile": settings.deployment_profile.value,
         "database_type": settings.database.database_type.value,
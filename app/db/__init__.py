@@ -14,6 +14,7 @@ from pathlib import Path
 from sqlalchemy import select, text
 
 from app.auth.password import generate_password
+from app.auth.user_cache import get_user_cache
 
 # Import core database components
 from app.db.base import Base
@@ -135,6 +136,7 @@ async def _insert_default_data() -> None:
                 admin.is_active = True
                 admin.failed_login_count = 0
                 await session.commit()
+                get_user_cache().invalidate(admin.id, admin.username)
                 logger.info(f"Admin password set for development: {password}")
 
     except Exception as e:
@@ -190,6 +192,7 @@ async def ensure_admin_user() -> bool:
             if not admin.is_active:
                 admin.is_active = True
                 await session.commit()
+                get_user_cache().invalidate(admin.id, admin.username)
                 logger.info("Admin user activated")
 
             # In development, ensure password is known
@@ -198,6 +201,7 @@ async def ensure_admin_user() -> bool:
                 if not verify_password(test_password, admin.password_hash):
                     admin.password_hash = hash_password(test_password)
                     await session.commit()
+                    get_user_cache().invalidate(admin.id, admin.username)
                     logger.info(
                         f"Admin password reset for development: {test_password}"
                     )
@@ -0,0 +1,58 @@
+# app/db/migrations/versions/8ce12cdc2efb_add_ix_api_keys_user_active.py
+"""Add partial index on active API keys per user
+
+Revision ID: 8ce12cdc2efb
+Revises:
+Create Date: 2026-10-17 16:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = "8ce12cdc2efb"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_api_keys_user_active"
+
+
+def _index_state() -> tuple[bool, bool]:
+    """
+    Return whether the api_keys table and the index exist.
+
+    The APIKey model declares the index in __table_args__, so databases
+    created by create_all already have it. The table is checked first:
+    get_indexes raises NoSuchTableError when api_keys is missing.
+    """
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("api_keys"):
+        return False, False
+    has_index = any(
+        index["name"] == INDEX_NAME for index in inspector.get_indexes("api_keys")
+    )
+    return True, has_index
+
+
+def upgrade() -> None:
+    """Apply migration."""
+    has_table, has_index = _index_state()
+    # Without the table there is nothing to index; create_all adds both
+    if not has_table or has_index:
+        return
+    op.create_index(
+        INDEX_NAME,
+        "api_keys",
+        ["created_by_user_id"],
+        postgresql_where=sa.text("is_active"),
+        sqlite_where=sa.text("is_active IS 1"),
+    )
+
+
+def downgrade() -> None:
+    """Revert migration."""
+    _, has_index = _index_state()
+    if has_index:
+        op.drop_index(INDEX_NAME, table_name="api_keys")
@@ -11,7 +11,16 @@ import json
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import BaseModel
@@ -110,6 +119,17 @@ class APIKey(BaseModel):
         doc="Rate limit per hour",
     )
 
+    # Partial index covering the "active keys for a user" lookup; inactive
+    # (revoked) keys are left out so listing never reads them
+    __table_args__ = (
+        Index(
+            "ix_api_keys_user_active",
+            "created_by_user_id",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active IS 1"),
+        ),
+    )
+
     # Relationships - Use forward reference (string in quotes)
     created_by: Mapped[User] = relationship(
         "User",  # String reference for SQLAlchemy
@@ -120,8 +140,13 @@ class APIKey(BaseModel):
     @property
     def scopes(self) -> list[str]:
         """Get scopes as a Python list"""
+        return self.parse_scopes(self._scopes)
+
+    @staticmethod
+    def parse_scopes(raw: str | None) -> list[str]:
+        """Parse a stored JSON scopes column into a Python list"""
         try:
-            return json.loads(self._scopes) if self._scopes else ["admin"]
+            return json.loads(raw) if raw else ["admin"]
         except (json.JSONDecodeError, TypeError):
             return ["admin"]
 
@@ -12,6 +12,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.auth.manager import get_auth_manager
+from app.auth.user_cache import get_user_cache
 from app.db.models.user import User
 from app.db.repositories.base import PaginatedRepository
 from app.utils.logging import get_logger
@@ -26,6 +28,18 @@ class UserRepository(PaginatedRepository[User]):
     def __init__(self, session: AsyncSession):
         super().__init__(session, User)
 
+    async def update_by_id(self, id: int, **kwargs: Any) -> User | None:
+        """Update user by ID and drop its cached authentication snapshot"""
+        user = await super().update_by_id(id, **kwargs)
+        get_user_cache().invalidate(user_id=id)
+        return user
+
+    async def delete_by_id(self, id: int) -> bool:
+        """Delete user by ID and drop its cached authentication snapshot"""
+        deleted = await super().delete_by_id(id)
+        get_user_cache().invalidate(user_id=id)
+        return deleted
+
     async def get_by_username(self, username: str) -> User | None:
         """Get user by username"""
         stmt = select(User).where(User.username == username)
@@ -193,6 +207,7 @@ class UserRepository(PaginatedRepository[User]):
     async def deactivate_user(self, user_id: int) -> User | None:
         """Deactivate user account"""
         user = await self.update_by_id(user_id, is_active=False)
+        get_auth_manager().invalidate_user_api_keys(user_id)
 
         if user:
             logger.info(f"Deactivated user: {user.username} (id: {user_id})")
@@ -60,6 +60,8 @@ except ImportError:
 
 # Import database system (M0 implementation)
 try:
+    from app.auth.password import warm_up_password_hashing
+    from app.auth.usage import get_usage_tracker
     from app.db.init import ensure_database_ready, get_database_info
     from app.db.models.settings import SystemSettings
     from app.db.models.user import User
@@ -149,6 +151,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[Any]:
                 await session_manager.initialize()
                 print("✅ Database session manager initialized")
 
+                # Batch API key usage writes in the background
+                get_usage_tracker().start()
+
+                # Warm up Argon2 so the first login doesn't pay for it
+                warm_up_password_hashing()
+
                 # Get database info for logging
                 try:
                     db_info = await get_database_info()
@@ -204,6 +212,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[Any]:
     print("🛑 Shutting down Harbor Container Updater...")
 
     try:
+        # Write pending API key usage before closing the database
+        if DATABASE_AVAILABLE:
+            await get_usage_tracker().stop()
+
         # Close database connections
         if session_manager:
             await session_manager.close()
@@ -290,7 +302,9 @@ def create_app() -> FastAPI:
 
     # Register API routers
     from app.api.auth import router as auth_router
+    from app.auth.middleware import AuthSessionMiddleware
 
+    app.add_middleware(AuthSessionMiddleware)
     app.include_router(auth_router)
 
     # Health check endpoint (required for Docker health checks)
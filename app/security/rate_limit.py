@@ -17,6 +17,7 @@ Features:
 
 import asyncio
 import functools
+import math
 import time
 from collections import defaultdict
 from collections.abc import Awaitable, Callable
@@ -28,6 +29,7 @@ from starlette.types import ASGIApp
 
 from app.config import DeploymentProfile, get_settings
 from app.security.headers import SecurityResponseHandler
+from app.utils.cache import TTLCache
 
 
 class SlidingWindowRateLimiter:
@@ -116,6 +118,98 @@ class SlidingWindowRateLimiter:
                 del self.requests[key]
 
 
+class TokenBucketRateLimiter:
+    """
+    Per-key token bucket rate limiter.
+
+    Each key holds up to ``capacity`` tokens refilled at ``refill_rate``
+    tokens per second. Checks and updates are O(1) and never await, so
+    callers on the event loop need no lock. Buckets idle long enough to
+    refill completely are evicted, since they are indistinguishable from
+    a fresh bucket.
+    """
+
+    def __init__(
+        self, capacity: int, refill_rate: float, max_keys: int = 10000
+    ) -> None:
+        """
+        Initialize token bucket rate limiter.
+
+        Args:
+            capacity: Maximum tokens per key (burst size)
+            refill_rate: Tokens added per second
+            max_keys: Maximum number of tracked keys
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        # (tokens, last_update) per key, expiring once a bucket would be full
+        self._buckets: TTLCache[str, tuple[float, float]] = TTLCache(
+            maxsize=max_keys, ttl=capacity / refill_rate
+        )
+
+    def _tokens(self, key: str, now: float) -> float:
+        """Get the current token count for a key after refilling."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return float(self.capacity)
+
+        tokens, last_update = bucket
+        return min(self.capacity, tokens + (now - last_update) * self.refill_rate)
+
+    def retry_after(self, key: str) -> int:
+        """
+        Get seconds until a key has a token available.
+
+        Args:
+            key: Unique key for the client
+
+        Returns:
+            Seconds to wait, 0 if a token is available now
+        """
+        tokens = self._tokens(key, time.monotonic())
+        if tokens >= 1:
+            return 0
+        return math.ceil((1 - tokens) / self.refill_rate)
+
+    def consume(self, key: str) -> bool:
+        """
+        Take a token from a key's bucket.
+
+        Args:
+            key: Unique key for the client
+
+        Returns:
+            True if a token was available, False if the bucket is empty
+        """
+        now = time.monotonic()
+        tokens = self._tokens(key, now)
+        if tokens < 1:
+            return False
+
+        self._buckets.set(key, (tokens - 1, now))
+        return True
+
+    def refund(self, key: str) -> None:
+        """
+        Return a token taken by consume() to a key's bucket.
+
+        Lets callers reserve a token before doing the work it guards and
+        give it back once the outcome turns out not to count.
+
+        Args:
+            key: Unique key for the client
+        """
+        if key not in self._buckets:
+            return
+
+        now = time.monotonic()
+        tokens = self._tokens(key, now) + 1
+        if tokens >= self.capacity:
+            self._buckets.pop(key)
+        else:
+            self._buckets.set(key, (tokens, now))
+
+
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """
     Rate limiting middleware for Harbor API protection.
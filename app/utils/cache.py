@@ -0,0 +1,112 @@
+# app/utils/cache.py
+"""
+Harbor Caching Utilities
+
+Small in-process caches used on hot request paths.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Generic, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING: Any = object()
+
+
+class TTLCache(Generic[K, V]):  # noqa: UP046 - PEP 695 syntax needs Python 3.12
+    """
+    Bounded least-recently-used cache whose entries expire after a TTL.
+
+    Expiry uses the monotonic clock so wall-clock changes cannot extend
+    or shorten an entry's lifetime. All operations are guarded by a lock
+    so the cache can be shared between the event loop and worker threads.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept before evicting the oldest
+            ttl: Time-to-live of each entry in seconds
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing or expired
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        """
+        Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: K, default: V | None = None) -> V | None:
+        """
+        Remove a key and return its value if it has not expired.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing or expired
+
+        Returns:
+            Removed value or default
+        """
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+            if entry is _MISSING or entry[0] <= time.monotonic():
+                return default
+            return entry[1]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key, _MISSING) is not _MISSING  # type: ignore[arg-type]
+
+    def __len__(self) -> int:
+        return len(self._data)
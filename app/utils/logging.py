@@ -11,6 +11,62 @@ import sys
 from pathlib import Path
 
 
+# Longest user-supplied value written to a log message (prevents log flooding)
+_MAX_LOG_VALUE_LENGTH = 100
+
+# Translation table for log sanitization: tabs become spaces, all other
+# control characters (including CR/LF) are dropped in a single C-level pass
+_SANITIZE_TABLE = str.maketrans({chr(i): "" for i in range(32) if i != 9} | {"\t": " "})
+
+
+def sanitize_for_logging(value: str) -> str:
+    """
+    Sanitize user input for safe logging.
+
+    Removes newlines and carriage returns to prevent log injection attacks.
+    Limits length to prevent excessive log entries.
+
+    Args:
+        value: The string to sanitize
+
+    Returns:
+        Sanitized string safe for logging
+    """
+    if not value:
+        return ""
+
+    # Fast path: typical usernames and key names need no changes
+    if len(value) <= _MAX_LOG_VALUE_LENGTH and value.isascii() and value.isprintable():
+        return value
+
+    # Remove newlines, carriage returns, and other control characters
+    sanitized = value.translate(_SANITIZE_TABLE)
+
+    # Limit length to prevent log flooding
+    if len(sanitized) > _MAX_LOG_VALUE_LENGTH:
+        sanitized = sanitized[:_MAX_LOG_VALUE_LENGTH] + "..."
+
+    return sanitized
+
+
+class Sanitized:
+    """
+    Log argument that sanitizes its value only when the record is emitted.
+
+    Pass user-supplied values (usernames, key names) as %-style logging
+    arguments, keeping them in the message for every formatter, with no
+    sanitization work for records filtered out by the logger's level.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: str):
+        self.value = value
+
+    def __str__(self) -> str:
+        return sanitize_for_logging(self.value)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance with the specified name.
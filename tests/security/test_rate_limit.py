@@ -0,0 +1,54 @@
+# tests/security/test_rate_limit.py
+"""Test in-process rate limiters."""
+
+from app.security.rate_limit import TokenBucketRateLimiter
+
+
+class TestTokenBucketRateLimiter:
+    """Test TokenBucketRateLimiter class."""
+
+    def test_allows_burst_up_to_capacity(self, monkeypatch):
+        """Test a key can consume its full capacity, then is limited."""
+        monkeypatch.setattr("app.security.rate_limit.time.monotonic", lambda: 100.0)
+        limiter = TokenBucketRateLimiter(capacity=3, refill_rate=1 / 60)
+
+        assert limiter.retry_after("1.2.3.4") == 0
+        assert all(limiter.consume("1.2.3.4") for _ in range(3))
+        assert limiter.consume("1.2.3.4") is False
+        assert limiter.retry_after("1.2.3.4") > 0
+
+        # Other keys are unaffected
+        assert limiter.consume("5.6.7.8") is True
+
+    def test_tokens_refill_over_time(self, monkeypatch):
+        """Test tokens are replenished at the refill rate."""
+        now = [100.0]
+        monkeypatch.setattr("app.security.rate_limit.time.monotonic", lambda: now[0])
+        limiter = TokenBucketRateLimiter(capacity=2, refill_rate=1.0)
+
+        assert limiter.consume("ip") and limiter.consume("ip")
+        assert limiter.retry_after("ip") == 1
+
+        now[0] += 1.0
+        assert limiter.retry_after("ip") == 0
+        assert limiter.consume("ip") is True
+        assert limiter.consume("ip") is False
+
+    def test_refund_returns_token(self, monkeypatch):
+        """Test a refunded token can be consumed again, up to capacity."""
+        monkeypatch.setattr("app.security.rate_limit.time.monotonic", lambda: 100.0)
+        limiter = TokenBucketRateLimiter(capacity=2, refill_rate=1 / 60)
+
+        assert limiter.consume("ip") and limiter.consume("ip")
+        assert limiter.consume("ip") is False
+
+        limiter.refund("ip")
+        assert limiter.consume("ip") is True
+        assert limiter.consume("ip") is False
+
+        # Refunds never raise a bucket above capacity
+        limiter.refund("ip")
+        limiter.refund("ip")
+        limiter.refund("ip")
+        assert limiter.consume("ip") and limiter.consume("ip")
+        assert limiter.consume("ip") is False
@@ -0,0 +1,186 @@
+# tests/unit/api/test_auth.py
+"""Test authentication API endpoints."""
+
+import contextlib
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api import auth as auth_api
+from app.auth import manager as auth_manager_module
+from app.auth.password import hash_password
+from app.auth.sessions import get_session_manager
+from app.auth.user_cache import get_user_cache
+from app.config import get_settings
+from app.db.models.user import User
+from app.db.session import get_db
+from app.security.rate_limit import TokenBucketRateLimiter
+
+
+PASSWORD = "Harbor123!"  # pragma: allowlist secret
+
+
+@pytest.fixture
+async def admin_user(committed_session) -> User:
+    """Active user that can log in with PASSWORD."""
+    user = User(
+        username="admin",
+        password_hash=hash_password(PASSWORD),
+        display_name="Administrator",
+        is_admin=True,
+        is_active=True,
+    )
+    committed_session.add(user)
+    await committed_session.commit()
+    return user
+
+
+@pytest.fixture
+async def client(monkeypatch, test_session_factory):
+    """Client for an app serving the auth router against the test database."""
+
+    async def test_get_db():
+        async with test_session_factory() as session:
+            yield session
+
+    @contextlib.asynccontextmanager
+    async def test_async_session():
+        async with test_session_factory() as session:
+            yield session
+            await session.commit()
+
+    # Fresh per-process auth state for every test
+    monkeypatch.setattr(auth_api, "get_async_session", test_async_session)
+    monkeypatch.setattr(
+        auth_api,
+        "_failed_login_limiter",
+        TokenBucketRateLimiter(capacity=3, refill_rate=1 / 60),
+    )
+    monkeypatch.setattr(auth_manager_module, "_auth_manager", None)
+    get_user_cache().clear()
+
+    app = FastAPI()
+    app.include_router(auth_api.router)
+    app.dependency_overrides[get_db] = test_get_db
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+    get_user_cache().clear()
+
+
+async def login(client: AsyncClient, password: str = PASSWORD, **extra):
+    """Post a login request for the admin user."""
+    return await client.post(
+        "/api/v1/auth/login",
+        json={"username": "admin", "password": password, **extra},
+    )
+
+
+@pytest.mark.database
+class TestLogin:
+    """Test the /login endpoint."""
+
+    async def test_success_sets_cookie_and_body(self, client, admin_user):
+        """Test a valid login returns the session body and cookie."""
+        response = await login(client)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["success"] is True
+        assert body["message"] == "Login successful"
+        assert body["user"] == {
+            "id": admin_user.id,
+            "username": "admin",
+            "display_name": "Administrator",
+            "is_admin": True,
+        }
+        # Serialized by LoginResponse, as before the endpoint was hand-rolled
+        assert body["expires_at"].endswith("Z")
+
+        session = get_session_manager().get_session(body["session_id"])
+        assert session is not None
+        assert session.csrf_token == body["csrf_token"]
+
+        security = get_settings().security
+        expected = (
+            f"harbor_session={body['session_id']}; HttpOnly; "
+            f"Max-Age={security.session_timeout_hours * 3600}; Path=/; SameSite=lax"
+        )
+        if security.require_https:
+            expected += "; Secure"
+        assert response.headers["set-cookie"] == expected
+
+    async def test_remember_me_extends_cookie(self, client, admin_user):
+        """Test remember_me quadruples the cookie lifetime."""
+        response = await login(client, remember_me=True)
+
+        max_age = get_settings().security.session_timeout_hours * 3600 * 4
+        assert f"Max-Age={max_age};" in response.headers["set-cookie"]
+
+    async def test_wrong_password(self, client, admin_user, test_session_factory):
+        """Test a wrong password is rejected and counted on the user."""
+        response = await login(client, password="wrong")
+
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Invalid username or password"}
+        assert "set-cookie" not in response.headers
+
+        async with test_session_factory() as session:
+            user = await session.get(User, admin_user.id)
+        assert user.failed_login_count == 1
+
+    async def test_unknown_user(self, client):
+        """Test unknown usernames get the same error as wrong passwords."""
+        response = await login(client)
+
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Invalid username or password"}
+
+    async def test_inactive_user(self, client, admin_user, committed_session):
+        """Test disabled accounts cannot log in with the right password."""
+        admin_user.is_active = False
+        await committed_session.commit()
+
+        response = await login(client)
+
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Account is disabled"}
+
+    async def test_rate_limited_after_failures(self, client, admin_user):
+        """Test a client is throttled once its failure tokens run out."""
+        for _ in range(3):
+            assert (await login(client, password="wrong")).status_code == 401
+
+        response = await login(client)
+
+        assert response.status_code == 429
+        assert 0 < int(response.headers["retry-after"]) <= 60
+
+    async def test_successful_logins_are_refunded(self, client, admin_user):
+        """Test successful logins don't use up the failure budget."""
+        for _ in range(5):
+            assert (await login(client)).status_code == 200
+
+        for _ in range(3):
+            assert (await login(client, password="wrong")).status_code == 401
+        assert (await login(client)).status_code == 429
+
+    async def test_account_locked_after_failures(self, client, admin_user, monkeypatch):
+        """Test an account locks after max failures, whatever the client."""
+        monkeypatch.setattr(
+            auth_api,
+            "_failed_login_limiter",
+            TokenBucketRateLimiter(capacity=100, refill_rate=1 / 60),
+        )
+        for _ in range(5):
+            assert (await login(client, password="wrong")).status_code == 401
+
+        response = await login(client)
+
+        assert response.status_code == 401
+        assert response.json() == {
+            "detail": "Account temporarily locked due to too many failed attempts"
+        }
@@ -0,0 +1,66 @@
+# tests/unit/auth/test_api_keys.py
+"""Test API key management functionality."""
+
+import hmac
+
+import pytest
+
+from app.auth.api_keys import APIKeyManager
+
+
+@pytest.fixture
+def api_key_manager(monkeypatch):
+    """API key manager with a fixed secret."""
+    secret = "test-secret-key"  # pragma: allowlist secret
+    monkeypatch.setenv("HARBOR_SECRET_KEY", secret)
+    return APIKeyManager()
+
+
+class TestAPIKeyManager:
+    """Test APIKeyManager class."""
+
+    def test_hash_matches_standard_hmac(self, api_key_manager):
+        """Test precomputed HMAC states produce standard HMAC-SHA256."""
+        for api_key in ("sk_harbor_abc", "x" * 200, ""):
+            expected = hmac.digest(
+                api_key_manager._hmac_key, api_key.encode(), "sha256"
+            ).hex()
+            assert api_key_manager.hash_api_key(api_key) == expected
+
+    def test_generate_and_verify(self, api_key_manager):
+        """Test generated keys verify against their hash."""
+        plain_key, hashed_key = api_key_manager.generate_api_key()
+
+        assert plain_key.startswith(APIKeyManager.KEY_PREFIX)
+        assert api_key_manager.verify_api_key(plain_key, hashed_key) is True
+        assert api_key_manager.verify_api_key(plain_key + "x", hashed_key) is False
+
+    def test_validate_format(self, api_key_manager):
+        """Test API key format validation."""
+        assert api_key_manager.validate_api_key_format("sk_harbor_" + "a" * 43)
+        assert not api_key_manager.validate_api_key_format("")
+        assert not api_key_manager.validate_api_key_format("sk_other_" + "a" * 43)
+        assert not api_key_manager.validate_api_key_format("sk_harbor_short")
+        assert not api_key_manager.validate_api_key_format(
+            "sk_harbor_" + "a" * 42 + "!"
+        )
+
+    def test_settings_reload_rebuilds_manager(self, monkeypatch):
+        """Test a settings reload picks up a changed secret key."""
+        from app.auth.api_keys import get_api_key_manager
+        from app.config import reload_settings
+
+        secret_keys = ("first-secret", "second-secret")  # pragma: allowlist secret
+        monkeypatch.setenv("HARBOR_SECRET_KEY", secret_keys[0])
+        reload_settings()
+        first_hash = get_api_key_manager().hash_api_key("sk_harbor_abc")
+
+        monkeypatch.setenv("HARBOR_SECRET_KEY", secret_keys[1])
+        reload_settings()
+        manager = get_api_key_manager()
+
+        assert manager.hash_api_key("sk_harbor_abc") != first_hash
+        assert (
+            manager.hash_api_key("sk_harbor_abc")
+            == hmac.digest(manager._hmac_key, b"sk_harbor_abc", "sha256").hex()
+        )
@@ -0,0 +1,57 @@
+# tests/unit/auth/test_dependencies.py
+"""Test authentication dependencies."""
+
+import pytest
+
+from app.auth import dependencies
+from app.auth.dependencies import _get_default_user, clear_default_user_cache
+from app.db.models.user import User
+
+
+@pytest.fixture(autouse=True)
+def _reset_default_user_cache():
+    """Start and end every test without a cached default user."""
+    clear_default_user_cache()
+    yield
+    clear_default_user_cache()
+
+
+@pytest.mark.database
+class TestDefaultUser:
+    """Test the cached default user lookup."""
+
+    async def test_returns_session_user(self, async_session, sample_user):
+        """Test the default user is the session's own, current instance."""
+        first = await _get_default_user(async_session)
+        assert first is sample_user
+
+        # Cached id: still resolved through the session's identity map
+        assert await _get_default_user(async_session) is sample_user
+
+    async def test_sees_changes_within_ttl(
+        self, test_session_factory, committed_session
+    ):
+        """Test changes to the user are visible on the next request."""
+        user = User(username="admin", password_hash="x", display_name="Admin")
+        committed_session.add(user)
+        await committed_session.commit()
+
+        async with test_session_factory() as db:
+            assert (await _get_default_user(db)).display_name == "Admin"
+
+        user.display_name = "Renamed"
+        await committed_session.commit()
+
+        async with test_session_factory() as db:
+            assert (await _get_default_user(db)).display_name == "Renamed"
+
+    async def test_caches_missing_user(self, async_session, monkeypatch):
+        """Test a missing default user is not looked up again within the TTL."""
+        assert await _get_default_user(async_session) is None
+
+        async def fail_get(*args, **kwargs):
+            raise AssertionError("default user was looked up again")
+
+        monkeypatch.setattr(async_session, "get", fail_get)
+        assert await _get_default_user(async_session) is None
+        assert dependencies._default_user_id is not None
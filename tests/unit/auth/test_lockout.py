@@ -0,0 +1,131 @@
+# tests/unit/auth/test_lockout.py
+"""Test failed login attempt stores."""
+
+import time
+from datetime import timedelta
+
+from app.auth.lockout import InMemoryFailedAttemptsStore, RedisFailedAttemptsStore
+
+
+WINDOW = timedelta(minutes=30)
+
+
+class FakePipeline:
+    """Minimal stand-in for a redis.asyncio transaction pipeline."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def incr(self, key):
+        self.commands.append(("incr", key))
+
+    def expire(self, key, seconds):
+        self.commands.append(("expire", key, seconds))
+
+    async def execute(self):
+        results = []
+        for command, key, *args in self.commands:
+            if command == "incr":
+                self.client.data[key] = self.client.data.get(key, 0) + 1
+                results.append(self.client.data[key])
+            else:
+                self.client.expiry[key] = args[0]
+                results.append(True)
+        return results
+
+
+class FakeRedis:
+    """Minimal stand-in for a redis.asyncio client."""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def get(self, key):
+        value = self.data.get(key)
+        return None if value is None else str(value).encode()
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+class TestInMemoryFailedAttemptsStore:
+    """Test InMemoryFailedAttemptsStore class."""
+
+    async def test_old_attempts_expire(self, monkeypatch):
+        """Test attempts older than the window are dropped."""
+        clock = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+        store = InMemoryFailedAttemptsStore(max_attempts=5, window=WINDOW)
+
+        await store.increment("admin")
+        clock[0] += WINDOW.total_seconds() - 60
+        for _ in range(4):
+            await store.increment("admin")
+        assert await store.count("admin") == 5
+
+        clock[0] += 120
+        assert await store.count("admin") == 4
+        assert await store.count("other") == 0
+
+    async def test_keeps_only_max_attempts(self):
+        """Test at most max_attempts timestamps are kept per username."""
+        store = InMemoryFailedAttemptsStore(max_attempts=3, window=WINDOW)
+
+        for _ in range(10):
+            count = await store.increment("admin")
+
+        assert count == 3
+        await store.reset("admin")
+        assert await store.count("admin") == 0
+
+
+class TestRedisFailedAttemptsStore:
+    """Test RedisFailedAttemptsStore class."""
+
+    async def test_increment_count_reset(self):
+        """Test counters are incremented atomically with a window expiry."""
+        client = FakeRedis()
+        fallback = InMemoryFailedAttemptsStore(max_attempts=5, window=WINDOW)
+        store = RedisFailedAttemptsStore(client, WINDOW, fallback=fallback)
+
+        assert await store.increment("admin") == 1
+        assert await store.increment("admin") == 2
+        assert await store.count("admin") == 2
+        assert client.expiry[store.KEY_PREFIX + "admin"] == 1800
+
+        await store.reset("admin")
+        assert await store.count("admin") == 0
+
+    async def test_falls_back_when_redis_unavailable(self):
+        """Test Redis errors degrade to the in-process fallback store."""
+
+        class DownRedis(FakeRedis):
+            def pipeline(self, transaction=True):
+                raise ConnectionError("redis down")
+
+            async def get(self, key):
+                raise ConnectionError("redis down")
+
+            async def delete(self, key):
+                raise ConnectionError("redis down")
+
+        fallback = InMemoryFailedAttemptsStore(max_attempts=5, window=WINDOW)
+        store = RedisFailedAttemptsStore(DownRedis(), WINDOW, fallback=fallback)
+
+        assert await store.increment("admin") == 1
+        assert await store.increment("admin") == 2
+        assert await store.count("admin") == 2
+
+        await store.reset("admin")
+        assert await store.count("admin") == 0
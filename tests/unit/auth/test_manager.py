@@ -0,0 +1,54 @@
+# tests/unit/auth/test_manager.py
+"""Test authentication manager functionality."""
+
+import pytest
+
+from app.auth.manager import AuthenticationManager, CachedAPIKey
+
+
+@pytest.fixture
+def auth_manager(monkeypatch):
+    """Authentication manager with a fixed secret."""
+    secret = "test-secret-key"  # pragma: allowlist secret
+    monkeypatch.setenv("HARBOR_SECRET_KEY", secret)
+    return AuthenticationManager()
+
+
+class TestAccountLockout:
+    """Test failed login tracking and account lockout."""
+
+    async def test_locks_after_max_attempts(self, auth_manager):
+        """Test the account locks once max_login_attempts is reached."""
+        for _ in range(auth_manager.max_login_attempts - 1):
+            await auth_manager.record_failed_attempt("admin")
+        assert await auth_manager.is_account_locked("admin") is False
+
+        await auth_manager.record_failed_attempt("admin")
+        assert await auth_manager.is_account_locked("admin") is True
+        assert await auth_manager.is_account_locked("other") is False
+
+        await auth_manager.clear_failed_attempts("admin")
+        assert await auth_manager.is_account_locked("admin") is False
+
+
+class TestAPIKeyCache:
+    """Test the verified API key cache."""
+
+    def test_invalidate_api_key(self, auth_manager):
+        """Test revoked keys are dropped from the cache."""
+        cached = CachedAPIKey(id=1, name="ci", user_id=1, expires_at=None)
+        auth_manager._api_key_cache.set("hash", cached)
+
+        auth_manager.invalidate_api_key("hash")
+        auth_manager.invalidate_api_key("missing")
+
+        assert auth_manager._api_key_cache.get("hash") is None
+
+    def test_invalidate_user_api_keys(self, auth_manager):
+        """Test deactivating a user drops its cached keys."""
+        cached = CachedAPIKey(id=1, name="ci", user_id=7, expires_at=None)
+        auth_manager._api_key_cache.set("hash", cached)
+
+        auth_manager.invalidate_user_api_keys(7)
+
+        assert auth_manager._api_key_cache.get("hash") is None
@@ -0,0 +1,92 @@
+# tests/unit/auth/test_middleware.py
+"""Test authentication middleware."""
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.auth.dependencies import get_current_session
+from app.auth.middleware import (
+    AuthSessionMiddleware,
+    extract_auth_headers,
+    extract_session_cookie,
+)
+from app.auth.sessions import SessionData
+
+
+class FakeAuthManager:
+    """Auth manager stub that knows a single session."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def validate_session(self, session_id):
+        self.calls += 1
+        if session_id == "valid":
+            return SessionData(
+                session_id="valid", user_id=1, username="admin", is_admin=True
+            )
+        return None
+
+
+def make_client(monkeypatch) -> tuple[TestClient, FakeAuthManager]:
+    """Create a test app with the middleware installed."""
+    manager = FakeAuthManager()
+    monkeypatch.setattr("app.auth.middleware.get_auth_manager", lambda: manager)
+    monkeypatch.setattr("app.auth.dependencies.get_auth_manager", lambda: manager)
+
+    app = FastAPI()
+    app.add_middleware(AuthSessionMiddleware)
+
+    @app.get("/whoami")
+    async def whoami(session: SessionData | None = Depends(get_current_session)):
+        return {"user": session.username if session else None}
+
+    return TestClient(app), manager
+
+
+class TestAuthSessionMiddleware:
+    """Test AuthSessionMiddleware class."""
+
+    def test_resolves_session_once(self, monkeypatch):
+        """Test the dependency reuses the session resolved by the middleware."""
+        client, manager = make_client(monkeypatch)
+
+        response = client.get("/whoami", cookies={"harbor_session": "valid"})
+
+        assert response.json() == {"user": "admin"}
+        assert manager.calls == 1
+
+    def test_invalid_or_missing_cookie(self, monkeypatch):
+        """Test requests without a valid session get no session."""
+        client, manager = make_client(monkeypatch)
+
+        assert client.get("/whoami").json() == {"user": None}
+        client.cookies.set("harbor_session", "bogus")
+        assert client.get("/whoami").json() == {"user": None}
+        assert manager.calls == 1
+
+
+def test_extract_session_cookie():
+    """Test the session cookie is parsed from the raw Cookie header."""
+    assert extract_session_cookie("harbor_session=abc") == "abc"
+    assert extract_session_cookie("theme=dark; harbor_session=abc; x=1") == "abc"
+    assert extract_session_cookie("other_harbor_session=abc") is None
+    assert extract_session_cookie("harbor_session=") is None
+    assert extract_session_cookie("") is None
+
+
+def test_extract_auth_headers():
+    """Test session and API key are extracted in a single header walk."""
+    headers = [
+        (b"cookie", b"harbor_session=abc"),
+        (b"authorization", b"Bearer sk_harbor_bearer"),
+    ]
+    assert extract_auth_headers(headers) == ("abc", "sk_harbor_bearer")
+
+    headers.append((b"x-api-key", b"sk_harbor_header"))
+    assert extract_auth_headers(headers) == ("abc", "sk_harbor_header")
+
+    assert extract_auth_headers([(b"authorization", b"Basic dXNlcg==")]) == (
+        None,
+        None,
+    )
@@ -2,9 +2,12 @@
 """Test password management functionality."""
 
 import pytest
+from argon2 import PasswordHasher
 from app.auth.password import (
     PasswordManager,
+    dummy_password_hash,
     hash_password,
+    needs_rehash,
     verify_password,
     validate_password,
     generate_password,
@@ -76,9 +79,51 @@ class TestPasswordManager:
         password = generate_password(16)
 
         assert len(password) == 16
+        assert not set(password) & set("0O1lI")
         valid, errors = validate_password(password)
         assert valid is True
 
         # Test uniqueness
         password2 = generate_password(16)
         assert password != password2
+
+    def test_dummy_password_hash(self):
+        """Test the dummy hash is reused and uses the real Argon2 parameters."""
+        dummy = dummy_password_hash()
+
+        assert dummy_password_hash() is dummy
+        assert dummy.split("$")[3] == hash_password("Secret123!").split("$")[3]
+        assert verify_password("Secret123!", dummy) is False
+
+    def test_needs_rehash(self):
+        """Test hashes with weaker Argon2 parameters are flagged for rehash."""
+        weak = PasswordHasher(time_cost=1, memory_cost=8192, parallelism=1)
+
+        assert needs_rehash(weak.hash("Secret123!")) is True
+        assert needs_rehash(hash_password("Secret123!")) is False
+
+    def test_verify_password_caches_success(self, monkeypatch):
+        """Test successful verifications are cached and failures are not."""
+        from app.auth import password as password_module
+
+        hashed = hash_password("Secret123!")
+        assert verify_password("Secret123!", hashed) is True
+
+        calls = []
+        real_hasher = password_module._password_hasher
+
+        class CountingHasher:
+            def verify(self, *args):
+                calls.append(args)
+                return real_hasher.verify(*args)
+
+            def check_needs_rehash(self, hashed):
+                return real_hasher.check_needs_rehash(hashed)
+
+        monkeypatch.setattr(password_module, "_password_hasher", CountingHasher())
+
+        assert verify_password("Secret123!", hashed) is True
+        assert calls == []
+        assert verify_password("Wrong123!", hashed) is False
+        assert verify_password("Wrong123!", hashed) is False
+        assert len(calls) == 2
@@ -1,6 +1,8 @@
 # tests/unit/auth/test_sessions.py
 """Test session management functionality."""
 
+import time
+
 import pytest
 from datetime import datetime, timedelta, UTC
 from app.auth.sessions import SessionManager, SessionData
@@ -50,6 +52,22 @@ class TestSessionManager:
         retrieved = session_manager.get_session(session.session_id)
         assert retrieved is None
 
+    def test_cleanup_expired_sessions(self, session_manager, monkeypatch):
+        """Test cleanup removes due sessions and requeues refreshed ones."""
+        expired = session_manager.create_session(user_id=1, username="testuser")
+        refreshed = session_manager.create_session(user_id=2, username="other")
+        refreshed.expires_at = datetime.now(UTC) + timedelta(days=365)
+
+        # Jump past the default session timeout
+        later = time.time() + timedelta(days=60).total_seconds()
+        monkeypatch.setattr("app.auth.sessions.time.time", lambda: later)
+
+        assert session_manager.cleanup_expired_sessions() == 1
+        assert session_manager.get_session(expired.session_id) is None
+        assert session_manager.get_session(refreshed.session_id) is refreshed
+        assert session_manager.get_user_session_count(1) == 0
+        assert session_manager.cleanup_expired_sessions() == 0
+
     def test_invalidate_session(self, session_manager):
         """Test session invalidation."""
         session = session_manager.create_session(user_id=1, username="testuser")
@@ -57,6 +75,43 @@ class TestSessionManager:
         assert session_manager.invalidate_session(session.session_id) is True
         assert session_manager.get_session(session.session_id) is None
 
+    def test_cleanup_at_exact_expiry(self, session_manager, monkeypatch):
+        """Test a session expiring exactly now is kept and cleanup returns."""
+        session = session_manager.create_session(user_id=1, username="testuser")
+        expires_epoch = session.expires_at.timestamp()
+        monkeypatch.setattr("app.auth.sessions.time.time", lambda: expires_epoch)
+
+        assert session_manager.cleanup_expired_sessions() == 0
+        assert session_manager.get_session(session.session_id) is session
+
+    def test_invalidate_user_sessions(self, session_manager):
+        """Test all of a user's sessions are invalidated together."""
+        first = session_manager.create_session(user_id=1, username="testuser")
+        second = session_manager.create_session(user_id=1, username="testuser")
+        other = session_manager.create_session(user_id=2, username="other")
+
+        assert session_manager.invalidate_user_sessions(1) == 2
+        assert session_manager.invalidate_user_sessions(1) == 0
+        assert session_manager.get_session(first.session_id) is None
+        assert session_manager.get_session(second.session_id) is None
+        assert session_manager.get_session(other.session_id) is other
+        assert session_manager.get_user_session_count(1) == 0
+
+    def test_cleanup_user_sessions_skips_stale_ids(self, session_manager):
+        """Test the session limit ignores IDs with no live session."""
+        sessions = [
+            session_manager.create_session(user_id=1, username="testuser")
+            for _ in range(5)
+        ]
+        session_manager._user_sessions[1].add("stale-session-id")
+
+        session_manager._cleanup_user_sessions(1, max_sessions=5)
+
+        assert all(
+            session_manager.get_session(session.session_id) is session
+            for session in sessions
+        )
+
     def test_csrf_token_validation(self, session_manager):
         """Test CSRF token validation."""
         session = session_manager.create_session(user_id=1, username="testuser")
@@ -70,3 +125,28 @@ class TestSessionManager:
             session_manager.validate_csrf_token(session.session_id, "invalid_token")
             is False
         )
+        assert session_manager.validate_csrf_token(session.session_id, "é") is False
+
+
+def test_session_data_dict_round_trip():
+    """Test sessions serialize to epoch times and still read ISO dicts."""
+    expires_at = datetime.now(UTC) + timedelta(hours=1)
+    session = SessionData("sid", 1, "testuser", expires_at=expires_at)
+
+    data = session.to_dict()
+    assert data["v"] == 2
+    assert data["expires_at"] == expires_at.timestamp()
+
+    restored = SessionData.from_dict(data)
+    assert restored.to_dict() == data
+    assert restored.expires_at == expires_at
+
+    legacy = {
+        "session_id": "sid",
+        "user_id": 1,
+        "username": "testuser",
+        "created_at": session.created_at.isoformat(),
+        "expires_at": expires_at.isoformat(),
+    }
+    assert SessionData.from_dict(legacy).expires_at == expires_at
+    assert SessionData.from_dict({**data, "expires_at": None}).is_expired() is False
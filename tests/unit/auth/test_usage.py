@@ -0,0 +1,82 @@
+# tests/unit/auth/test_usage.py
+"""Test API key usage tracking."""
+
+import contextlib
+from datetime import UTC, datetime
+
+import pytest
+
+from app.auth import usage
+from app.auth.usage import APIKeyUsageTracker
+from app.db.models.api_key import APIKey
+
+
+class TestAPIKeyUsageTracker:
+    """Test APIKeyUsageTracker class."""
+
+    def test_record_coalesces_per_key(self):
+        """Test repeated uses of a key collapse into one pending update."""
+        tracker = APIKeyUsageTracker()
+        first = datetime(2025, 1, 1, tzinfo=UTC)
+        last = datetime(2025, 1, 2, tzinfo=UTC)
+
+        tracker.record(1, first, "10.0.0.1")
+        tracker.record(1, last, "10.0.0.2")
+        tracker.record(2, first, None)
+
+        assert tracker._pending[1].count == 2
+        assert tracker._pending[1].last_used_at == last
+        assert tracker._pending[1].last_used_ip == "10.0.0.2"
+        assert tracker._pending[2].count == 1
+
+    async def test_start_and_stop(self, monkeypatch):
+        """Test stopping the tracker flushes pending usage."""
+        tracker = APIKeyUsageTracker(flush_interval=60)
+        flushed = []
+
+        async def fake_flush():
+            flushed.append(dict(tracker._pending))
+            tracker._pending.clear()
+            return len(flushed[-1])
+
+        monkeypatch.setattr(tracker, "flush", fake_flush)
+
+        tracker.start()
+        assert tracker.running is True
+        tracker.record(1, datetime.now(UTC), None)
+
+        await tracker.stop()
+
+        assert tracker.running is False
+        assert 1 in flushed[0]
+
+    @pytest.mark.database
+    async def test_flush_writes_usage(
+        self, monkeypatch, test_session_factory, sample_api_key
+    ):
+        """Test a flush adds to usage_count and sets the last-used details."""
+
+        @contextlib.asynccontextmanager
+        async def test_async_session():
+            async with test_session_factory() as session:
+                yield session
+                await session.commit()
+
+        monkeypatch.setattr(usage, "get_async_session", test_async_session)
+        tracker = APIKeyUsageTracker()
+        first = datetime(2025, 1, 1, tzinfo=UTC)
+        last = datetime(2025, 1, 2, tzinfo=UTC)
+
+        tracker.record(sample_api_key.id, first, "10.0.0.1")
+        tracker.record(sample_api_key.id, last, "10.0.0.2")
+        assert await tracker.flush() == 1
+        tracker.record(sample_api_key.id, last, "10.0.0.3")
+        assert await tracker.flush() == 1
+        assert await tracker.flush() == 0
+
+        async with test_session_factory() as session:
+            api_key = await session.get(APIKey, sample_api_key.id)
+
+        assert api_key.usage_count == 3
+        assert api_key.last_used_at.replace(tzinfo=UTC) == last
+        assert api_key.last_used_ip == "10.0.0.3"
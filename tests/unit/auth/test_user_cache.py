@@ -0,0 +1,64 @@
+# tests/unit/auth/test_user_cache.py
+"""Test authentication user cache."""
+
+import pytest
+
+from app.auth.user_cache import CachedUser, UserCache
+
+
+def _cached_user(user_id: int = 1, username: str = "testuser") -> CachedUser:
+    return CachedUser(
+        id=user_id,
+        username=username,
+        password_hash="$argon2id$fake",  # pragma: allowlist secret
+        is_admin=False,
+        is_active=True,
+        display_name=None,
+    )
+
+
+class TestUserCache:
+    """Test UserCache class."""
+
+    def test_lookup_by_username_and_id(self):
+        """Test cached users are indexed by username and ID."""
+        cache = UserCache()
+        user = _cached_user()
+        cache.put(user)
+
+        assert cache.get_by_username("testuser") is user
+        assert cache.get_by_id(1) is user
+
+    def test_username_lookup_is_case_sensitive(self):
+        """Test usernames are matched exactly, like the database query."""
+        cache = UserCache()
+        cache.put(_cached_user())
+
+        assert cache.get_by_username("TestUser") is None
+
+    def test_invalidate_by_id_clears_both_indexes(self):
+        """Test invalidating by ID also drops the username entry."""
+        cache = UserCache()
+        cache.put(_cached_user())
+
+        cache.invalidate(user_id=1)
+
+        assert cache.get_by_username("testuser") is None
+        assert cache.get_by_id(1) is None
+
+    def test_invalidate_by_username_clears_both_indexes(self):
+        """Test invalidating by username also drops the ID entry."""
+        cache = UserCache()
+        cache.put(_cached_user())
+
+        cache.invalidate(username="testuser")
+
+        assert cache.get_by_username("testuser") is None
+        assert cache.get_by_id(1) is None
+
+    def test_snapshot_is_immutable(self):
+        """Test cached snapshots cannot be mutated."""
+        user = _cached_user()
+
+        with pytest.raises(AttributeError):
+            user.is_active = False  # type: ignore[misc]
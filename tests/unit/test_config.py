@@ -41,3 +41,21 @@ def test_basic_imports() -> None:
     assert json.dumps({"test": True}) == '{"test": true}'
     assert logging.getLogger("test")
     assert pathlib.Path()
+
+
+@pytest.mark.unit
+def test_relative_data_dir_follows_working_directory(tmp_path, monkeypatch) -> None:
+    """Test relative data directories are created again after a chdir"""
+    from app.config import create_harbor_settings
+
+    monkeypatch.setenv("HARBOR_DATA_DIR", "data")
+    monkeypatch.setenv("HARBOR_LOGS_DIR", "logs")
+    for name in ("first", "second"):
+        workdir = tmp_path / name
+        workdir.mkdir()
+        monkeypatch.chdir(workdir)
+
+        create_harbor_settings()
+
+        assert (workdir / "data" / "backups").is_dir()
+        assert (workdir / "logs").is_dir()
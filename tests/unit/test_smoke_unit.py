@@ -63,6 +63,21 @@ class TestHarborImports:
         assert "Harbor Container Updater" in all_output
         assert "M0 Milestone" in all_output
 
+    @pytest.mark.unit
+    def test_app_info_is_serializable(self) -> None:
+        """Test app info serializes to JSON and is not shared between callers."""
+        import json
+
+        from app import get_app_info
+
+        info = get_app_info()
+        assert json.loads(json.dumps(info))["features"]["zero_config"] is True
+
+        info["profiles"].append("custom")
+        info["features"]["zero_config"] = False
+        assert "custom" not in get_app_info()["profiles"]
+        assert get_app_info()["features"]["zero_config"] is True
+
 
 class TestProjectStructure:
     """Test that the project structure is set up correctly."""
@@ -0,0 +1,63 @@
+# tests/unit/utils/test_cache.py
+"""Test in-process cache utilities."""
+
+import pytest
+
+from app.utils.cache import TTLCache
+
+
+class TestTTLCache:
+    """Test TTLCache class."""
+
+    def test_set_and_get(self):
+        """Test storing and retrieving values."""
+        cache = TTLCache(maxsize=4, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert "a" in cache
+        assert cache.get("missing") is None
+        assert cache.get("missing", 0) == 0
+
+    def test_expired_entries_are_dropped(self, monkeypatch):
+        """Test entries expire after the TTL."""
+        now = [1000.0]
+        monkeypatch.setattr("app.utils.cache.time.monotonic", lambda: now[0])
+
+        cache = TTLCache(maxsize=4, ttl=10)
+        cache.set("a", 1)
+
+        now[0] += 9
+        assert cache.get("a") == 1
+
+        now[0] += 2
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted when full."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_pop(self):
+        """Test removing entries."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.pop("a") == 1
+        assert cache.pop("a") is None
+        assert len(cache) == 0
+
+    def test_invalid_arguments(self):
+        """Test invalid sizes are rejected."""
+        with pytest.raises(ValueError):
+            TTLCache(maxsize=0, ttl=60)
+        with pytest.raises(ValueError):
+            TTLCache(maxsize=1, ttl=0)
@@ -0,0 +1,13 @@
+# tests/unit/utils/test_logging.py
+"""Test logging utilities."""
+
+from app.utils.logging import Sanitized, sanitize_for_logging
+
+
+def test_sanitize_for_logging():
+    """Test control characters are stripped and long values truncated."""
+    assert sanitize_for_logging("ad\r\nmin\tx\x00") == "admin x"
+    assert sanitize_for_logging("") == ""
+    assert sanitize_for_logging("a" * 150) == "a" * 100 + "..."
+    assert sanitize_for_logging("admin") == "admin"
+    assert str(Sanitized("ad\nmin")) == "admin"